@@ -1,6 +1,7 @@
-import os
 import re
-from groq import Groq
+from groq_client import APIKeyError, CircuitOpenError, get_chat_client, groq_breaker
+from chat_cache import get_cached_answer, cache_answer
+from nav_router import match_navigation
 from dotenv import load_dotenv
 load_dotenv()
 SYSTEM_PROMPT = """
@@ -33,28 +34,55 @@ ROUTE_MAP = {
 NAV_REGEX = re.compile(r"^NAVIGATE\s*:\s*(\w+)$", re.IGNORECASE)
 
 
-class APIKeyError(Exception):
-    pass
+UNAVAILABLE_MESSAGE = "Chat service is currently unavailable. Please contact the administrator."
+ERROR_MESSAGE = "I'm sorry, I can't respond right now. Please try again later."
 
 
-def get_groq_client():
-    api_key = os.environ.get("GROQ_API_KEY")
-    
-    if not api_key:
-        raise APIKeyError(
-            "GROQ_API_KEY environment variable is not set. "
-            "Please set it in your .env file or environment variables."
-        )
-    
-    if not api_key.strip():
-        raise APIKeyError(
-            "GROQ_API_KEY is empty. Please provide a valid API key."
-        )
+def _local_reply(message: str):
+    """Reply that needs no API call (invalid input, plain navigation, cached answer), or None."""
+    # Validate input
+    if not message or not message.strip():
+        return {
+            "action": "chat",
+            "message": "Please ask a question."
+        }
     
-    try:
-        return Groq(api_key=api_key)
-    except Exception as e:
-        raise APIKeyError(f"Failed to initialize Groq client: {str(e)}")
+    if len(message) > 500:
+        return {
+            "action": "chat",
+            "message": "Please ask a shorter question (max 500 characters)."
+        }
+
+    # Plain "open <page>" requests don't need the model
+    page = match_navigation(message)
+    if page in ROUTE_MAP:
+        return {
+            "action": "navigate",
+            "redirect": ROUTE_MAP[page]
+        }
+
+    # Repeated questions are answered without calling the API
+    return get_cached_answer(message)
+
+
+def _chat_messages(message: str) -> list:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT.strip()},
+        {"role": "user", "content": message.strip()}
+    ]
+
+
+def _navigate_reply(line: str):
+    """Navigate reply if the line is a valid NAVIGATE command, else None."""
+    match = NAV_REGEX.match(line.strip())
+    if match:
+        route = ROUTE_MAP.get(match.group(1).lower())
+        if route:
+            return {
+                "action": "navigate",
+                "redirect": route
+            }
+    return None
 
 
 def call_chatbot_groq(message: str) -> dict:
@@ -67,59 +95,47 @@ def call_chatbot_groq(message: str) -> dict:
     Returns:
         dict with 'action' and either 'message' or 'redirect'
     """
-    # Validate input
-    if not message or not message.strip():
-        return {
-            "action": "chat",
-            "message": "Please ask a question."
-        }
-    
-    if len(message) > 500:
-        return {
-            "action": "chat",
-            "message": "Please ask a shorter question (max 500 characters)."
-        }
+    local = _local_reply(message)
+    if local is not None:
+        return local
 
     try:
         # Get Groq client
-        client = get_groq_client()
+        client = get_chat_client()
         
         # Make API call
-        completion = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT.strip()},
-                {"role": "user", "content": message.strip()}
-            ],
-            temperature=0.3,
-            max_tokens=180,
-        )
+        with groq_breaker.guard():
+            completion = client.chat.completions.create(
+                model="llama-3.1-8b-instant",
+                messages=_chat_messages(message),
+                temperature=0.3,
+                max_tokens=180,
+            )
 
         content = completion.choices[0].message.content.strip()
 
-        # Check for navigation command
-        match = NAV_REGEX.match(content)
-        if match:
-            page = match.group(1).lower()
-            route = ROUTE_MAP.get(page)
-            if route:
-                return {
-                    "action": "navigate",
-                    "redirect": route
-                }
-
-        # Return normal chat response
-        return {
+        # Check for navigation command, else return normal chat response
+        reply = _navigate_reply(content) or {
             "action": "chat",
             "message": content
         }
+        cache_answer(message, reply)
+        return reply
 
     except APIKeyError as e:
         # API key configuration error
         print(f"API Key Error: {e}")
         return {
             "action": "chat",
-            "message": "Chat service is currently unavailable. Please contact the administrator."
+            "message": UNAVAILABLE_MESSAGE
+        }
+    
+    except CircuitOpenError as e:
+        # Groq has been failing; don't wait on it until the breaker probes again
+        print(f"Groq unavailable: {e}")
+        return {
+            "action": "chat",
+            "message": ERROR_MESSAGE
         }
     
     except Exception as e:
@@ -127,5 +143,95 @@ def call_chatbot_groq(message: str) -> dict:
         print(f"Groq API error: {type(e).__name__}: {e}")
         return {
             "action": "chat",
-            "message": "I'm sorry, I can't respond right now. Please try again later."
-        }
\ No newline at end of file
+            "message": ERROR_MESSAGE
+        }
+
+
+def _reply_events(reply: dict):
+    if reply["action"] == "navigate":
+        yield "navigate", {"redirect": reply["redirect"]}
+    else:
+        yield "token", {"text": reply["message"]}
+    yield "done", {"action": reply["action"]}
+
+
+def _could_be_navigate(head: str) -> bool:
+    head = head.upper()
+    return head.startswith("NAVIGATE") or "NAVIGATE".startswith(head)
+
+
+def stream_chatbot_groq(message: str):
+    """
+    Streaming variant of call_chatbot_groq.
+    
+    Yields (event, data) pairs:
+        ("token", {"text": ...})        a piece of the answer, as Groq produces it
+        ("navigate", {"redirect": ...}) the model asked to open a page
+        ("done", {"action": ...})       the reply is complete
+        ("error", {"message": ...})     the API call failed
+    
+    Text is only held back while the first line could still be a
+    NAVIGATE command; after that every piece is passed on immediately.
+    """
+    local = _local_reply(message)
+    if local is not None:
+        yield from _reply_events(local)
+        return
+
+    sent = []
+    try:
+        client = get_chat_client()
+        with groq_breaker.guard():
+            stream = client.chat.completions.create(
+                model="llama-3.1-8b-instant",
+                messages=_chat_messages(message),
+                temperature=0.3,
+                max_tokens=180,
+                stream=True,
+            )
+            with stream:
+                pending = ""
+                holding = True
+                for chunk in stream:
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                    if not text:
+                        continue
+                    if holding:
+                        pending += text
+                        head = pending.lstrip()
+                        if "\n" not in head and _could_be_navigate(head):
+                            continue
+                        holding = False
+                        reply = _navigate_reply(head.split("\n", 1)[0])
+                        if reply:
+                            cache_answer(message, reply)
+                            yield from _reply_events(reply)
+                            return
+                        text = head
+                    sent.append(text)
+                    yield "token", {"text": text}
+
+                if holding:
+                    head = pending.strip()
+                    reply = _navigate_reply(head) or {"action": "chat", "message": head}
+                    cache_answer(message, reply)
+                    yield from _reply_events(reply)
+                    return
+
+        cache_answer(message, {"action": "chat", "message": "".join(sent).strip()})
+        yield "done", {"action": "chat"}
+
+    except APIKeyError as e:
+        # API key configuration error
+        print(f"API Key Error: {e}")
+        yield "error", {"message": UNAVAILABLE_MESSAGE}
+    
+    except CircuitOpenError as e:
+        # Groq has been failing; don't wait on it until the breaker probes again
+        print(f"Groq unavailable: {e}")
+        yield "error", {"message": ERROR_MESSAGE}
+    
+    except Exception as e:
+        # Any other error (network, API rate limit, etc.); partial text is not cached
+        print(f"Groq API error: {type(e).__name__}: {e}")
+        yield "error", {"message": ERROR_MESSAGE}
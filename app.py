@@ -68,11 +68,12 @@ def create_app(config_class=Config):
     from routes.calendar import bp as calendar_bp
     from routes.piket import bp as piket_bp
     from routes.chat import bp as chat_bp
+    from routes.metrics import bp as metrics_bp
 
     for blueprint in (
         auth_bp, profile_bp, members_bp, sessions_bp,
         attendance_bp, pics_bp, notulensi_bp, calendar_bp,
-        piket_bp, chat_bp,
+        piket_bp, chat_bp, metrics_bp,
     ):
         app.register_blueprint(blueprint)
 
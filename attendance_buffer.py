@@ -0,0 +1,173 @@
+"""
+Write-behind buffer for attendance check-ins.
+
+When ATTENDANCE_WRITE_BEHIND is enabled, _record_attendance validates a
+check-in, acknowledges it immediately and hands the row to this buffer. A
+background thread writes buffered rows in one multi-row INSERT every
+ATTENDANCE_FLUSH_INTERVAL_MS, or sooner once ATTENDANCE_FLUSH_MAX_ROWS are
+waiting, so a burst of check-ins costs a handful of commits instead of one
+per request. Rows are inserted in arrival order and the buffer is flushed
+when the worker exits.
+
+If a batch fails, its rows are inserted one by one so a single bad row (for
+example one whose session was deleted meanwhile) is the only one lost.
+While the database is unreachable rows stay buffered and are retried on the
+next flush.
+"""
+
+import atexit
+import logging
+import threading
+from flask import current_app
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import InterfaceError, OperationalError
+from extensions import db
+from models import Attendance
+
+logger = logging.getLogger(__name__)
+
+# Errors that say nothing about the rows themselves; keep the rows and retry
+RETRYABLE_ERRORS = (OperationalError, InterfaceError)
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def insert_ignore_duplicates(rows):
+    """
+    Insert attendance rows in one multi-row INSERT, skipping any that hit the
+    unique_session_user constraint. Returns {(session_id, user_id): attendance_id}
+    for the rows actually inserted.
+    """
+    if db.session.get_bind().dialect.name == "postgresql":
+        stmt = postgresql.insert(Attendance).values(rows).on_conflict_do_nothing(
+            constraint="unique_session_user"
+        )
+    else:
+        stmt = sqlite.insert(Attendance).values(rows).on_conflict_do_nothing(
+            index_elements=["session_id", "user_id"]
+        )
+    result = db.session.execute(stmt.returning(Attendance.session_id, Attendance.user_id, Attendance.id))
+    return {(session_id, user_id): attendance_id for session_id, user_id, attendance_id in result}
+
+
+class AttendanceWriteBuffer:
+    def __init__(self, app, flush_interval_ms, max_rows):
+        self.app = app
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_rows = max_rows
+        self._rows = []
+        self._keys = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="attendance-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, row):
+        """Queue a row; returns False if the same session/user is already waiting."""
+        key = (row["session_id"], row["user_id"])
+        with self._lock:
+            if self._stopped or key in self._keys:
+                return False
+            self._keys.add(key)
+            self._rows.append(row)
+            if len(self._rows) >= self.max_rows:
+                self._wake.set()
+        return True
+
+    def flush(self):
+        """Write everything buffered so far. Safe to call from any thread."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._rows = self._rows, []
+            if not batch:
+                return 0
+
+            with self.app.app_context():
+                try:
+                    inserted = insert_ignore_duplicates(batch)
+                    db.session.commit()
+                    unwritten, dropped = [], 0
+                except Exception:
+                    db.session.rollback()
+                    logger.exception("Attendance flush of %d rows failed; inserting them one by one", len(batch))
+                    inserted, unwritten, dropped = self._insert_each(batch)
+                finally:
+                    db.session.remove()
+
+            if unwritten:
+                with self._lock:
+                    # Put them back in front so arrival order is kept
+                    self._rows = unwritten + self._rows
+            self._forget(batch[:len(batch) - len(unwritten)])
+
+            skipped = len(batch) - len(unwritten) - dropped - len(inserted)
+            if skipped:
+                logger.warning("Attendance flush skipped %d rows already recorded elsewhere", skipped)
+            return len(inserted)
+
+    def _insert_each(self, batch):
+        """
+        Insert rows one per transaction, dropping rows that fail on their own.
+        Returns (inserted, unwritten_rows, dropped_count); unwritten rows are
+        the ones not attempted because the database became unreachable.
+        """
+        inserted, dropped = {}, 0
+        for i, row in enumerate(batch):
+            try:
+                inserted.update(insert_ignore_duplicates([row]))
+                db.session.commit()
+            except RETRYABLE_ERRORS:
+                db.session.rollback()
+                logger.exception("Database unavailable; keeping %d attendance rows for the next flush",
+                                 len(batch) - i)
+                return inserted, batch[i:], dropped
+            except Exception:
+                db.session.rollback()
+                dropped += 1
+                logger.exception("Dropping buffered attendance of user %s for session %s",
+                                 row["user_id"], row["session_id"])
+        return inserted, [], dropped
+
+    def _forget(self, batch):
+        with self._lock:
+            for row in batch:
+                self._keys.discard((row["session_id"], row["user_id"]))
+
+    def close(self):
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        with self._lock:
+            if self._rows:
+                logger.error("Worker exiting with %d attendance rows that could not be written: %s",
+                             len(self._rows), [(r["session_id"], r["user_id"]) for r in self._rows])
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopped:
+                break
+            self.flush()
+
+
+def get_attendance_buffer():
+    """Per-process buffer, created on first use so it starts after gunicorn forks."""
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            app = current_app._get_current_object()
+            _buffer = AttendanceWriteBuffer(
+                app,
+                flush_interval_ms=app.config["ATTENDANCE_FLUSH_INTERVAL_MS"],
+                max_rows=app.config["ATTENDANCE_FLUSH_MAX_ROWS"],
+            )
+        return _buffer
@@ -0,0 +1,136 @@
+"""
+backfill.py — One-off data jobs for ManageSpace
+================================================
+Rewrites existing rows after a change to how data is stored. Each job works
+in batches, commits after every batch and can safely be re-run.
+
+Usage:
+    python backfill.py <job> [--batch-size N]
+
+Jobs:
+    images   Move inline base64 images out of notulensi HTML into the
+             notulensi_image store (see notulensi_images.py)
+    text     Fill the derived notulensi columns (plain_text, word_count,
+             excerpt, content_size) and refresh the search index
+"""
+
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ---------------------------------------------------------------------------
+# Validate DATABASE_URL before importing anything Flask-related
+# ---------------------------------------------------------------------------
+if not os.environ.get("DATABASE_URL"):
+    print("\n[ERROR] DATABASE_URL is not set in your environment or .env file.")
+    print("        Please configure it before running this script.\n")
+    sys.exit(1)
+
+
+from sqlalchemy import update
+from app import create_app
+from extensions import db
+from models import Notulensi
+from notulensi_images import extract_images
+from search import index_note
+
+app = create_app()
+
+
+def backfill_images(batch_size):
+    last_id = 0
+    notes_changed = images_stored = 0
+    while True:
+        rows = (
+            db.session.query(Notulensi.id, Notulensi.content)
+            .filter(Notulensi.id > last_id, Notulensi.content.contains("data:image/"))
+            .order_by(Notulensi.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        for note_id, content in rows:
+            new_content, count = extract_images(content)
+            if new_content == content:
+                continue
+            # Assigning updated_at to itself keeps its onupdate from firing:
+            # moving images out is not an edit to the minutes
+            db.session.execute(
+                update(Notulensi)
+                .where(Notulensi.id == note_id)
+                .values(updated_at=Notulensi.updated_at, **Notulensi.content_fields(new_content))
+            )
+            notes_changed += 1
+            images_stored += count
+
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"\n[ERROR] Batch after notulensi #{last_id} failed: {e}\n")
+            sys.exit(1)
+        last_id = rows[-1].id
+        print(f"  ... up to notulensi #{last_id}: {notes_changed} notes, {images_stored} images")
+
+    print(f"\n[SUCCESS] Moved {images_stored} images out of {notes_changed} notes.\n")
+
+
+def backfill_text(batch_size):
+    last_id = 0
+    done = 0
+    while True:
+        rows = (
+            db.session.query(Notulensi.id, Notulensi.content)
+            .filter(Notulensi.id > last_id)
+            .order_by(Notulensi.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        for note_id, content in rows:
+            fields = Notulensi.content_fields(content)
+            db.session.execute(
+                update(Notulensi)
+                .where(Notulensi.id == note_id)
+                .values(updated_at=Notulensi.updated_at, **fields)
+            )
+            index_note(note_id, fields["plain_text"])
+            done += 1
+
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"\n[ERROR] Batch after notulensi #{last_id} failed: {e}\n")
+            sys.exit(1)
+        last_id = rows[-1].id
+        print(f"  ... up to notulensi #{last_id}: {done} notes")
+
+    print(f"\n[SUCCESS] Derived text stored for {done} notes.\n")
+
+
+JOBS = {
+    "images": backfill_images,
+    "text": backfill_text,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="One-off data backfills")
+    parser.add_argument("job", choices=sorted(JOBS))
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    with app.app_context():
+        JOBS[args.job](args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
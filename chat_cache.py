@@ -0,0 +1,46 @@
+"""
+Answer cache for the chat assistant.
+
+Students keep asking the same few questions, so successful answers are kept
+per worker, keyed by a normalized form of the question: lowercased, with
+punctuation and extra whitespace removed and Indonesian/English filler
+words dropped. "How many rakaat is Dhuhr?" and "how many rakaat
+dhuhr" share one entry. Question words (what, how, kapan, berapa, ...) are
+kept because they change what is being asked.
+
+Admins can pin a curated answer for a question (it never expires) or purge
+cached answers; see routes/chat.py.
+"""
+
+import re
+from cache import TTLCache
+from config import Config
+
+# Only words that never change what is asked: articles, "is/are", polite
+# particles and "please explain". Pronouns, modals and prepositions stay
+# ("can I" and "can you", "about zakat" and "zakat" are different questions).
+STOPWORDS = frozenset("""
+    yang adalah ialah sih dong deh kok ya yah nah kak kakak min pak bu tolong mohon
+    tanya bertanya nanya jelaskan dijelaskan
+    the a an is are please explain
+""".split())
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+answer_cache = TTLCache(maxsize=Config.CHAT_CACHE_SIZE, ttl=Config.CHAT_CACHE_TTL)
+
+
+def normalize_question(message):
+    """Cache key for a question; falls back to all words if every word is a stopword."""
+    words = _WORD_RE.findall(message.lower())
+    kept = [w for w in words if w not in STOPWORDS]
+    return " ".join(kept or words)
+
+
+def get_cached_answer(message):
+    reply = answer_cache.get(normalize_question(message))
+    return dict(reply) if reply is not None else None
+
+
+def cache_answer(message, reply):
+    answer_cache.set(normalize_question(message), dict(reply))
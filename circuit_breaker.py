@@ -0,0 +1,116 @@
+"""
+Circuit breaker for calls to an external service.
+
+After `failure_threshold` failures in a row the circuit opens and calls fail
+immediately with CircuitOpenError instead of waiting on a service that is
+down or rate-limiting us. After `reset_timeout` seconds it half-opens: one
+call is let through as a probe, and its outcome closes the circuit again or
+re-opens it for another `reset_timeout`.
+
+Like the caches in cache.py, each gunicorn worker keeps its own state.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a call while the circuit is open"""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker. Only exceptions that are instances of
+    `failure_exceptions` count as failures; any other outcome means the
+    service answered.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30, failure_exceptions=(Exception,)):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_exceptions = failure_exceptions
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self.times_opened = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go ahead now; a True in half-open state claims the probe."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self._probing):
+                self._probing = self.state == HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self):
+        """Give up a call without an outcome (e.g. the client went away mid-stream)."""
+        with self._lock:
+            self._probing = False
+
+    @contextmanager
+    def guard(self):
+        """
+        Wrap one call to the service.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        try:
+            yield
+        except self.failure_exceptions:
+            self.record_failure()
+            raise
+        except Exception:
+            self.record_success()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+
+    def stats(self):
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.opened_at + self.reset_timeout - time.monotonic()), 1)
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "retry_in": retry_in,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
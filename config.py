@@ -29,8 +29,42 @@ class Config:
     FRONTEND_ORIGIN = os.environ.get("FRONTEND_ORIGIN", "http://localhost:8080")
 
     GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
+    # Shared Groq client (see groq_client.py); timeouts in seconds
+    GROQ_CONNECT_TIMEOUT = float(os.environ.get("GROQ_CONNECT_TIMEOUT", 5))
+    GROQ_READ_TIMEOUT = float(os.environ.get("GROQ_READ_TIMEOUT", 30))
+    GROQ_POOL_SIZE = int(os.environ.get("GROQ_POOL_SIZE", 10))
+    GROQ_MAX_RETRIES = int(os.environ.get("GROQ_MAX_RETRIES", 2))
+    # Chat replies are on the request path: fail each attempt to the breaker instead of retrying
+    GROQ_CHAT_MAX_RETRIES = int(os.environ.get("GROQ_CHAT_MAX_RETRIES", 0))
+    # Consecutive failed Groq calls before failing fast, and seconds until the next probe
+    GROQ_BREAKER_THRESHOLD = int(os.environ.get("GROQ_BREAKER_THRESHOLD", 5))
+    GROQ_BREAKER_RESET_TIMEOUT = float(os.environ.get("GROQ_BREAKER_RESET_TIMEOUT", 30))
+
+    # Per-worker cache of chat answers by normalized question (see chat_cache.py)
+    CHAT_CACHE_TTL = int(os.environ.get("CHAT_CACHE_TTL", 6 * 60 * 60))
+    CHAT_CACHE_SIZE = int(os.environ.get("CHAT_CACHE_SIZE", 512))
     CRON_SECRET_TOKEN = os.environ.get("CRON_SECRET_TOKEN")
 
+    # Per-worker cache of authenticated users used by token_required
+    IDENTITY_CACHE_TTL = int(os.environ.get("IDENTITY_CACHE_TTL", 60))
+    IDENTITY_CACHE_SIZE = int(os.environ.get("IDENTITY_CACHE_SIZE", 1024))
+
+    # Attendance write-behind buffering (see attendance_buffer.py)
+    ATTENDANCE_WRITE_BEHIND = os.environ.get("ATTENDANCE_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+    ATTENDANCE_FLUSH_INTERVAL_MS = int(os.environ.get("ATTENDANCE_FLUSH_INTERVAL_MS", 200))
+    ATTENDANCE_FLUSH_MAX_ROWS = int(os.environ.get("ATTENDANCE_FLUSH_MAX_ROWS", 100))
+
+    # Background jobs (AI summaries, etc.)
+    BACKGROUND_WORKERS = int(os.environ.get("BACKGROUND_WORKERS", 2))
+    SUMMARY_MAX_ATTEMPTS = int(os.environ.get("SUMMARY_MAX_ATTEMPTS", 3))
+    SUMMARY_RETRY_BACKOFF = float(os.environ.get("SUMMARY_RETRY_BACKOFF", 2.0))
+    # Seconds before content that could not be summarized is tried again (doubles per failure)
+    SUMMARY_FAILURE_BACKOFF = int(os.environ.get("SUMMARY_FAILURE_BACKOFF", 900))
+    SUMMARY_FAILURE_MAX_BACKOFF = int(os.environ.get("SUMMARY_FAILURE_MAX_BACKOFF", 86400))
+
+    # Notulensi revision history: store full content every N revisions (see revisions.py)
+    NOTULENSI_SNAPSHOT_INTERVAL = int(os.environ.get("NOTULENSI_SNAPSHOT_INTERVAL", 20))
+
     # Mailjet
     MAILJET_API_KEY = os.environ.get("MAILJET_API_KEY")
     MAILJET_SECRET_KEY = os.environ.get("MAILJET_SECRET_KEY")
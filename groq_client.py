@@ -0,0 +1,112 @@
+"""
+Process-wide Groq client shared by the chat assistant and the summarizer.
+
+Building a Groq client creates a new HTTP connection pool, so a client per
+call paid for a fresh TCP + TLS handshake every time. Instead one client is
+built on first use and reused, keeping connections alive between calls.
+Timeouts, pool size and retries come from the GROQ_* settings in config.py.
+
+Every Groq call goes through `groq_breaker.guard()`, so once Groq keeps
+timing out, refusing connections, rate-limiting or returning 5xx errors,
+calls fail fast with CircuitOpenError instead of tying up workers.
+
+Calls made while a user waits use `get_chat_client()`, which does not retry:
+the SDK's own retries would hold the request thread for several read
+timeouts and the breaker would only see one failure for all of them.
+"""
+
+import os
+import threading
+import httpx
+from flask import current_app
+import groq
+from groq import Groq
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from config import Config
+
+_client = None
+_client_key = None
+_client_pid = None
+_lock = threading.Lock()
+
+# Errors that mean Groq is unreachable or overloaded; other API errors
+# (bad request, auth) still count as Groq answering
+GROQ_FAILURES = (
+    groq.APIConnectionError,
+    groq.RateLimitError,
+    groq.InternalServerError,
+    httpx.TransportError,
+)
+
+groq_breaker = CircuitBreaker(
+    "groq",
+    failure_threshold=Config.GROQ_BREAKER_THRESHOLD,
+    reset_timeout=Config.GROQ_BREAKER_RESET_TIMEOUT,
+    failure_exceptions=GROQ_FAILURES,
+)
+
+
+class APIKeyError(Exception):
+    """Raised when API key is missing or invalid"""
+    pass
+
+
+def _build_client(api_key):
+    config = current_app.config
+    timeout = httpx.Timeout(config["GROQ_READ_TIMEOUT"], connect=config["GROQ_CONNECT_TIMEOUT"])
+    pool_size = config["GROQ_POOL_SIZE"]
+    http_client = httpx.Client(
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+    )
+    return Groq(
+        api_key=api_key,
+        http_client=http_client,
+        timeout=timeout,
+        max_retries=config["GROQ_MAX_RETRIES"],
+    )
+
+
+def get_groq_client():
+    """
+    Get the shared Groq client, building it on first use.
+
+    Raises:
+        APIKeyError: If GROQ_API_KEY is not set in environment
+    """
+    global _client, _client_key, _client_pid
+    api_key = os.environ.get("GROQ_API_KEY")
+
+    if not api_key:
+        raise APIKeyError(
+            "GROQ_API_KEY environment variable is not set. "
+            "Please set it in your .env file or environment variables."
+        )
+
+    if not api_key.strip():
+        raise APIKeyError(
+            "GROQ_API_KEY is empty. Please provide a valid API key."
+        )
+
+    with _lock:
+        # Rebuild after a key change or a fork (connections can't be shared across processes)
+        if _client is None or _client_key != api_key or _client_pid != os.getpid():
+            try:
+                _client = _build_client(api_key)
+            except Exception as e:
+                raise APIKeyError(f"Failed to initialize Groq client: {str(e)}")
+            _client_key, _client_pid = api_key, os.getpid()
+        return _client
+
+
+def get_chat_client():
+    """
+    Get the shared Groq client for request-path calls, without retries.
+
+    It shares the connection pool of get_groq_client(); only the retry count
+    (GROQ_CHAT_MAX_RETRIES) differs, so every failed attempt reaches the breaker.
+
+    Raises:
+        APIKeyError: If GROQ_API_KEY is not set in environment
+    """
+    return get_groq_client().with_options(max_retries=current_app.config["GROQ_CHAT_MAX_RETRIES"])
@@ -0,0 +1,94 @@
+"""
+Table-driven Gregorian -> Hijri (Umm al-Qura) conversion.
+
+ummalqura.HijriDate linearly scans its month table for every date it
+converts. Here the same table is turned once into an array of Gregorian
+ordinals of each month's first day, so a single date is a binary search and
+a range of dates is a walk along consecutive months.
+
+The table covers 1 Muharram 1356 H (1937-03-14) to the end of 1500 H
+(2077-11-16); dates outside it raise ValueError.
+"""
+
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import NamedTuple
+from ummalqura.hijri_date import HijriDate
+from ummalqura.ummalqura_arrray import UmalqurraArray
+
+# ummalqura stores Modified Chronological Julian Day Numbers; adding this
+# offset gives date.toordinal() values.
+_MCJDN_TO_ORDINAL = 678575
+# Months elapsed since 1 Muharram 1 H at the first table entry
+_FIRST_LUNATION = 16260
+
+MONTH_STARTS = array("l", (mcjdn + _MCJDN_TO_ORDINAL for mcjdn in UmalqurraArray.ummalqura_dat))
+MONTH_NAMES = HijriDate.month_dict
+
+MIN_DATE = date.fromordinal(MONTH_STARTS[0])
+MAX_DATE = date.fromordinal(MONTH_STARTS[-1] - 1)
+
+
+class HijriDay(NamedTuple):
+    year: int
+    month: int
+    day: int
+    month_len: int
+
+    @property
+    def month_name(self):
+        return MONTH_NAMES[self.month]
+
+    @property
+    def key(self):
+        """MM-DD, the format used by calendar.ISLAMIC_HOLIDAYS."""
+        return f"{self.month:02d}-{self.day:02d}"
+
+    def __str__(self):
+        return f"{self.day} {self.month_name} {self.year} H"
+
+
+def _month(index):
+    year, month = divmod(_FIRST_LUNATION + index, 12)
+    return year + 1, month + 1, MONTH_STARTS[index + 1] - MONTH_STARTS[index]
+
+
+def _month_index(ordinal):
+    index = bisect_right(MONTH_STARTS, ordinal) - 1
+    if index < 0 or index >= len(MONTH_STARTS) - 1:
+        raise ValueError(
+            f"{date.fromordinal(ordinal)} is outside the Umm al-Qura table ({MIN_DATE} to {MAX_DATE})"
+        )
+    return index
+
+
+def to_hijri(gregorian):
+    """Convert a datetime.date to a HijriDay."""
+    ordinal = gregorian.toordinal()
+    index = _month_index(ordinal)
+    year, month, month_len = _month(index)
+    return HijriDay(year, month, ordinal - MONTH_STARTS[index] + 1, month_len)
+
+
+def hijri_range(start, end):
+    """
+    Yield (date, HijriDay) for every day from start to end inclusive.
+
+    Only the first day is looked up; after that the walk steps through the
+    month table, so converting a range costs O(days) with no searching.
+    """
+    first, last = start.toordinal(), end.toordinal()
+    if first > last:
+        return
+    _month_index(last)
+    index = _month_index(first)
+    ordinal = first
+    while ordinal <= last:
+        year, month, month_len = _month(index)
+        month_start = MONTH_STARTS[index]
+        month_end = min(MONTH_STARTS[index + 1] - 1, last)
+        for day_ordinal in range(ordinal, month_end + 1):
+            yield date.fromordinal(day_ordinal), HijriDay(year, month, day_ordinal - month_start + 1, month_len)
+        ordinal = month_end + 1
+        index += 1
@@ -0,0 +1,67 @@
+"""Convert session.date to an indexed DATE column
+
+Revision ID: 30068b5e28bc
+Revises: 8a3b00f00479
+Create Date: 2026-10-17 12:18:52.940317
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '30068b5e28bc'
+down_revision = '8a3b00f00479'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing values are YYYY-MM-DD strings from the session form. Convert
+    # them in Python: SQLite's CAST(... AS DATE) yields a number, so an
+    # in-place type change would silently turn '2026-01-05' into 2026.
+    conn = op.get_bind()
+    session = sa.table('session', sa.column('id', sa.Integer), sa.column('date', sa.String))
+    dates, invalid = {}, []
+    for session_id, value in conn.execute(sa.select(session.c.id, session.c.date)):
+        try:
+            dates[session_id] = date.fromisoformat(value.strip())
+        except (AttributeError, ValueError):
+            invalid.append((session_id, value))
+    if invalid:
+        listed = ', '.join(f'#{session_id} {value!r}' for session_id, value in invalid[:20])
+        raise RuntimeError(
+            f'session.date has {len(invalid)} value(s) that are not YYYY-MM-DD dates: {listed}. '
+            'Fix them before running this migration.'
+        )
+
+    with op.batch_alter_table('session', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('date_value', sa.Date(), nullable=True))
+
+    session_dates = sa.table('session', sa.column('id', sa.Integer), sa.column('date_value', sa.Date))
+    for session_id, value in dates.items():
+        conn.execute(
+            session_dates.update().where(session_dates.c.id == session_id).values(date_value=value)
+        )
+
+    with op.batch_alter_table('session', schema=None) as batch_op:
+        batch_op.drop_column('date')
+
+    with op.batch_alter_table('session', schema=None) as batch_op:
+        batch_op.alter_column('date_value',
+               new_column_name='date',
+               existing_type=sa.Date(),
+               nullable=False)
+    op.create_index(op.f('ix_session_date'), 'session', ['date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('session', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_session_date'))
+        batch_op.alter_column('date',
+               existing_type=sa.Date(),
+               type_=sa.VARCHAR(length=50),
+               existing_nullable=False,
+               postgresql_using="to_char(date, 'YYYY-MM-DD')")
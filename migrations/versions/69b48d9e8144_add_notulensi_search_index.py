@@ -0,0 +1,86 @@
+"""Add full-text search index for notulensi
+
+Revision ID: 69b48d9e8144
+Revises: c578c796d505
+Create Date: 2026-10-17 14:05:52.471903
+
+"""
+import re
+from html import unescape
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '69b48d9e8144'
+down_revision = 'c578c796d505'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 200
+
+# Copied from search.py / utils.py as they were when this migration was
+# written, so later changes to the app can't alter what it does
+TS_CONFIG = 'simple'
+MARK_START, MARK_END = '\ue000', '\ue001'
+_TAG_RE = re.compile('<[^<]+?>')
+
+
+def search_text(content):
+    """Tags become spaces, entities are unescaped and whitespace collapsed."""
+    plain_text = ' '.join(unescape(_TAG_RE.sub(' ', content or '')).split())
+    return plain_text.replace(MARK_START, '').replace(MARK_END, '')
+
+
+notulensi = sa.table(
+    'notulensi',
+    sa.column('id', sa.Integer),
+    sa.column('content', sa.Text),
+)
+
+
+def upgrade():
+    # SQLite builds its FTS5 index on first use (see search.py)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.create_table('notulensi_search',
+    sa.Column('notulensi_id', sa.Integer(), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('document', postgresql.TSVECTOR(), nullable=False),
+    sa.ForeignKeyConstraint(['notulensi_id'], ['notulensi.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('notulensi_id')
+    )
+    op.create_index('ix_notulensi_search_document', 'notulensi_search', ['document'],
+                    unique=False, postgresql_using='gin')
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(notulensi.c.id, notulensi.c.content)
+            .where(notulensi.c.id > last_id)
+            .order_by(notulensi.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.text(
+                "INSERT INTO notulensi_search (notulensi_id, body, document) "
+                "VALUES (:id, :body, to_tsvector(:config, :body))"
+            ),
+            [{"id": note_id, "body": search_text(content), "config": TS_CONFIG} for note_id, content in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        op.execute("DROP TABLE IF EXISTS notulensi_fts")
+        return
+
+    op.drop_index('ix_notulensi_search_document', table_name='notulensi_search', postgresql_using='gin')
+    op.drop_table('notulensi_search')
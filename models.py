@@ -2,6 +2,7 @@ from flask_login import UserMixin
 from datetime import datetime
 
 from extensions import db
+from utils import html_to_plain_text, make_excerpt
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -11,19 +12,45 @@ class User(db.Model, UserMixin):
     must_change_password = db.Column(db.Boolean, default=True)
     class_name = db.Column(db.String(50))
     profile_picture = db.Column(db.String(255), default='default.png')
-    profile_picture_data = db.Column(db.LargeBinary, nullable=True)
+    # Deferred: only serve_profile_picture needs the image bytes
+    profile_picture_data = db.deferred(db.Column(db.LargeBinary, nullable=True))
     profile_picture_filename = db.Column(db.String(255), default='default.png')
+    profile_picture_hash = db.Column(db.String(64), nullable=True)
     pic_id = db.Column(db.Integer, db.ForeignKey('pic.id', name='fk_user_pic'), nullable=True)
     division_id = db.Column(db.Integer, db.ForeignKey('division.id'), nullable=True)
     can_mark_attendance = db.Column(db.Boolean, default=False)
 
+class ProfilePictureVariant(db.Model):
+    """Downscaled WebP copy of a user's profile picture, generated in the background"""
+    __tablename__ = 'profile_picture_variant'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    source_hash = db.Column(db.String(64), nullable=False)
+    data = db.deferred(db.Column(db.LargeBinary, nullable=False))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    user = db.relationship(
+        'User',
+        backref=db.backref('picture_variants', cascade='all, delete-orphan', passive_deletes=True),
+    )
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'size', name='unique_user_picture_size'),
+    )
+
+    def __repr__(self):
+        return f'<ProfilePictureVariant User:{self.user_id} {self.size}px>'
+
+
 class SessionPIC(db.Model):
     """Links sessions with PICs (divisions) - allows multiple PICs per session"""
     __tablename__ = 'session_pic'
     
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(db.Integer, db.ForeignKey('session.id', ondelete='CASCADE'), nullable=False)
-    pic_id = db.Column(db.Integer, db.ForeignKey('pic.id', ondelete='CASCADE'), nullable=False)
+    pic_id = db.Column(db.Integer, db.ForeignKey('pic.id', ondelete='CASCADE'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -41,7 +68,7 @@ class SessionPIC(db.Model):
 class Session(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(150), nullable=False)
-    date = db.Column(db.String(50), nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True)
     is_locked = db.Column(db.Boolean, default=False)
     session_type = db.Column(db.String(50), default='all', nullable=False)  # 'all', 'core', 'event'
     description = db.Column(db.Text, nullable=True)
@@ -56,7 +83,7 @@ class Session(db.Model):
 class Attendance(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(db.Integer, db.ForeignKey('session.id', ondelete='CASCADE'))
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
     status = db.Column(db.String(50), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     attendance_type = db.Column(db.String(50), default='regular', nullable=False)
@@ -88,13 +115,105 @@ class Division(db.Model):
 
 class Notulensi(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    session_id = db.Column(db.Integer, db.ForeignKey("session.id", ondelete='CASCADE'), nullable=False)
+    session_id = db.Column(db.Integer, db.ForeignKey("session.id", ondelete='CASCADE'), nullable=False, unique=True, index=True)
     content = db.Column(db.Text, nullable=False)
+    # Derived from content by set_content() so readers never re-parse the HTML
+    plain_text = db.deferred(db.Column(db.Text))
+    word_count = db.Column(db.Integer)
+    excerpt = db.Column(db.String(160))
+    content_size = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
+    # The news feed orders by it
+    updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow, index=True)
 
     session = db.relationship("Session", backref="notulensi")
 
+    @staticmethod
+    def content_fields(content):
+        """Column values for the given HTML content, including the derived ones"""
+        plain_text = html_to_plain_text(content)
+        return {
+            "content": content,
+            "plain_text": plain_text,
+            "word_count": len(plain_text.split()),
+            "excerpt": make_excerpt(plain_text),
+            "content_size": len(content.encode("utf-8")),
+        }
+
+    def set_content(self, content):
+        for key, value in self.content_fields(content).items():
+            setattr(self, key, value)
+
+
+class NotulensiSummary(db.Model):
+    """AI summary of a notulensi, keyed by the hash of the content it was generated from"""
+    __tablename__ = 'notulensi_summary'
+
+    id = db.Column(db.Integer, primary_key=True)
+    notulensi_id = db.Column(db.Integer, db.ForeignKey('notulensi.id', ondelete='CASCADE'), nullable=False, index=True)
+    cache_key = db.Column(db.String(120), unique=True, nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    # NULL when the content could not be summarized; retried after retry_after
+    summary = db.Column(db.Text, nullable=True)
+    failures = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    retry_after = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    notulensi = db.relationship(
+        'Notulensi',
+        backref=db.backref('summaries', cascade='all, delete-orphan', passive_deletes=True),
+    )
+
+    def __repr__(self):
+        return f'<NotulensiSummary {self.cache_key}>'
+
+
+class NotulensiImage(db.Model):
+    """Image extracted from notulensi HTML, stored once per distinct content"""
+    __tablename__ = 'notulensi_image'
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    mimetype = db.Column(db.String(50), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    data = db.deferred(db.Column(db.LargeBinary, nullable=False))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<NotulensiImage {self.sha256}>'
+
+
+class NotulensiRevision(db.Model):
+    """
+    One saved version of a notulensi. Snapshots hold the full content; other
+    revisions hold a delta against the previous revision, and base_revision
+    is the snapshot their chain starts from (see revisions.py).
+    """
+    __tablename__ = 'notulensi_revision'
+
+    id = db.Column(db.Integer, primary_key=True)
+    notulensi_id = db.Column(db.Integer, db.ForeignKey('notulensi.id', ondelete='CASCADE'), nullable=False)
+    revision = db.Column(db.Integer, nullable=False)
+    base_revision = db.Column(db.Integer, nullable=False)
+    is_snapshot = db.Column(db.Boolean, nullable=False, default=False)
+    data = db.deferred(db.Column(db.LargeBinary, nullable=False))
+    content_hash = db.Column(db.String(64), nullable=False)
+    content_size = db.Column(db.Integer, nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    author = db.relationship('User')
+    notulensi = db.relationship(
+        'Notulensi',
+        backref=db.backref('revisions', cascade='all, delete-orphan', passive_deletes=True),
+    )
+
+    __table_args__ = (
+        db.UniqueConstraint('notulensi_id', 'revision', name='unique_notulensi_revision'),
+    )
+
+    def __repr__(self):
+        return f'<NotulensiRevision {self.notulensi_id}#{self.revision}>'
+
 
 class JadwalPiket(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -116,7 +235,7 @@ class JadwalPiket(db.Model):
 class PiketAssignment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     jadwal_id = db.Column(db.Integer, db.ForeignKey('jadwal_piket.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     user = db.relationship('User', backref='piket_assignments')
@@ -135,7 +254,7 @@ class EmailReminderLog(db.Model):
     day_name = db.Column(db.String(20), nullable=False)
     recipients_count = db.Column(db.Integer, default=0)
     recipients = db.Column(db.Text)
-    sent_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     status = db.Column(db.String(20), default='success')
     error_message = db.Column(db.Text, nullable=True)
     
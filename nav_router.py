@@ -0,0 +1,90 @@
+"""
+Local navigation intent router for the chat assistant.
+
+Requests like "buka absensi" or "open the members page" only need a route
+from ai.ROUTE_MAP, so they are matched here with keyword and fuzzy matching
+instead of spending a Groq call on "NAVIGATE: <page>". The router only
+answers when it is confident: a short message, no question words, exactly
+one page mentioned, and nothing else in the message but navigation verbs,
+page words ("halaman", "page") and polite filler. "buka absensi" and
+"members page" navigate; "attendance rules" or "home prayer" are questions
+about something and fall through to the model.
+"""
+
+import re
+from difflib import get_close_matches
+
+PAGE_KEYWORDS = {
+    "dashboard": ("dashboard", "dasbor", "beranda", "home", "homepage", "halaman utama", "main page", "main menu"),
+    "attendance": ("attendance", "absensi", "absen", "kehadiran", "presensi", "daftar hadir"),
+    "members": ("members", "member", "member list", "anggota", "daftar anggota", "list anggota"),
+    "login": ("login", "log in", "sign in", "signin", "halaman masuk"),
+}
+
+NAV_WORDS = frozenset("""
+    open go goto show take navigate bring visit view back see check
+    buka membuka bukakan bukain pergi tampilkan lihat liat menuju arahkan pindah kembali balik cek
+""".split())
+PAGE_WORDS = frozenset("page halaman laman menu tab screen list daftar rekap utama main".split())
+FILLER_WORDS = frozenset("""
+    the a of to me my i can could you please pls now want wanna let lets us up
+    ke di ini itu saya aku gue mau ingin tolong mohon dong deh ya yuk ayo sih kak min sekarang rohis
+""".split())
+QUESTION_WORDS = frozenset("""
+    what why how when who which
+    apa apakah mengapa kenapa bagaimana gimana kapan siapa berapa bolehkah hukum
+""".split())
+
+MAX_WORDS = 8
+# "attendence" and "anggot" still match, "remember" doesn't match "member"
+FUZZY_CUTOFF = 0.86
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_WORD_PAGES = {
+    keyword: page
+    for page, keywords in PAGE_KEYWORDS.items()
+    for keyword in keywords if " " not in keyword
+}
+_PHRASE_PAGES = [
+    (re.compile(rf"\b{re.escape(keyword)}\b"), page)
+    for page, keywords in PAGE_KEYWORDS.items()
+    for keyword in keywords if " " in keyword
+]
+_FUZZY_VOCAB = [keyword for keyword in _WORD_PAGES if len(keyword) >= 4]
+
+
+def _word_page(word):
+    page = _WORD_PAGES.get(word)
+    if page or len(word) < 4 or word in NAV_WORDS or word in PAGE_WORDS:
+        return page
+    close = get_close_matches(word, _FUZZY_VOCAB, n=1, cutoff=FUZZY_CUTOFF)
+    return _WORD_PAGES[close[0]] if close else None
+
+
+def match_navigation(message):
+    """The ROUTE_MAP page a message asks to open, or None if it isn't clearly a navigation request."""
+    words = _WORD_RE.findall(message.lower())
+    if not words or len(words) > MAX_WORDS:
+        return None
+    word_set = set(words)
+    if word_set & QUESTION_WORDS:
+        return None
+
+    text = " ".join(words)
+    pages = set()
+    known = NAV_WORDS | PAGE_WORDS | FILLER_WORDS
+    for pattern, page in _PHRASE_PAGES:
+        match = pattern.search(text)
+        if match:
+            pages.add(page)
+            known = known | set(match.group().split())
+    for word in word_set - known:
+        page = _word_page(word)
+        if page is None:
+            # Anything besides the page and how to get there ("rules",
+            # "prayer", "problem") means the message is about something else
+            return None
+        pages.add(page)
+    if len(pages) != 1:
+        return None
+    return pages.pop()
@@ -0,0 +1,75 @@
+"""
+Content-addressed store for images pasted into notulensi.
+
+The rich-text editor embeds pasted images as base64 data: URIs. On save they
+are decoded, stored once per SHA-256 in notulensi_image and replaced in the
+HTML by /api/notulensi/images/<sha256>, which can be cached forever because
+its content never changes. SVG is left inline: served from our own origin it
+could carry script.
+"""
+
+import re
+import base64
+import binascii
+import hashlib
+from sqlalchemy.dialects import postgresql, sqlite
+from extensions import db
+from models import NotulensiImage
+
+IMAGE_URL_PREFIX = "/api/notulensi/images/"
+IMAGE_MIMETYPES = {
+    "image/png", "image/jpeg", "image/jpg", "image/gif", "image/webp", "image/bmp",
+}
+
+DATA_URI_RE = re.compile(
+    r"""(?P<quote>["'])data:(?P<mime>image/[a-z0-9.+-]+);base64,(?P<data>[A-Za-z0-9+/=\s]+)(?P=quote)""",
+    re.IGNORECASE,
+)
+
+
+def has_inline_images(content):
+    return "data:image/" in (content or "")
+
+
+def _store(images):
+    """Insert {sha256: (mimetype, data)}, skipping digests that are already stored."""
+    rows = [
+        {"sha256": digest, "mimetype": mime, "size": len(data), "data": data}
+        for digest, (mime, data) in images.items()
+    ]
+    if db.session.get_bind().dialect.name == "postgresql":
+        stmt = postgresql.insert(NotulensiImage).values(rows).on_conflict_do_nothing(index_elements=["sha256"])
+    else:
+        stmt = sqlite.insert(NotulensiImage).values(rows).on_conflict_do_nothing(index_elements=["sha256"])
+    db.session.execute(stmt)
+
+
+def extract_images(content):
+    """
+    Move inline data: images out of `content` into the image store, in the
+    caller's transaction. Returns (new_content, number_of_distinct_images).
+    """
+    if not has_inline_images(content):
+        return content, 0
+
+    images = {}
+
+    def replace(match):
+        mime = match.group("mime").lower()
+        if mime not in IMAGE_MIMETYPES:
+            return match.group(0)
+        try:
+            data = base64.b64decode("".join(match.group("data").split()), validate=True)
+        except (binascii.Error, ValueError):
+            return match.group(0)
+        if not data:
+            return match.group(0)
+        digest = hashlib.sha256(data).hexdigest()
+        images[digest] = ("image/jpeg" if mime == "image/jpg" else mime, data)
+        quote = match.group("quote")
+        return f"{quote}{IMAGE_URL_PREFIX}{digest}{quote}"
+
+    new_content = DATA_URI_RE.sub(replace, content)
+    if images:
+        _store(images)
+    return new_content, len(images)
@@ -0,0 +1,76 @@
+"""
+Opt-in keyset pagination for list endpoints.
+
+Without ?limit= an endpoint returns every row, as it always has. With it,
+at most `limit` rows come back together with an opaque next_cursor holding
+the sort key of the last row; passing that back as ?cursor= continues
+right after it using a WHERE on the sort key instead of OFFSET.
+"""
+
+import json
+import base64
+from datetime import date
+from flask import request
+from sqlalchemy import Date, tuple_
+
+MAX_LIMIT = 200
+
+
+def get_limit():
+    """The requested page size (capped at MAX_LIMIT), or None when not paginating."""
+    limit = request.args.get("limit", type=int)
+    if not limit or limit < 1:
+        return None
+    return min(limit, MAX_LIMIT)
+
+
+def encode_cursor(values):
+    values = [v.isoformat() if isinstance(v, date) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor back into sort-key values. Raises ValueError if it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+    return [_decode_value(column, v) for column, v in zip(columns, values)]
+
+
+def _decode_value(column, value):
+    # Dates travel as ISO strings; anything else must already be the column's Python type
+    if isinstance(column.type, Date):
+        if not isinstance(value, str):
+            raise ValueError("Invalid cursor")
+        return date.fromisoformat(value)
+    if isinstance(value, bool) or not isinstance(value, column.type.python_type):
+        raise ValueError("Invalid cursor")
+    return value
+
+
+def paginate(query, columns, key, descending=False):
+    """
+    Order `query` by `columns` (the last one must be unique, e.g. the id)
+    and apply ?limit=&cursor=. `key(row)` returns the row's values for
+    those columns.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page or
+    when ?limit= was not given. Raises ValueError for a bad cursor.
+    """
+    order = [c.desc() if descending else c.asc() for c in columns]
+    limit = get_limit()
+    if limit is None:
+        return query.order_by(*order).all(), None
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        sort_key, last = tuple_(*columns), tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(sort_key < last if descending else sort_key > last)
+
+    rows = query.order_by(*order).limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(key(rows[limit - 1]))
+    return rows, None
@@ -0,0 +1,182 @@
+"""
+Revision history for notulensi.
+
+Every save that changes a note's content adds a NotulensiRevision. Most
+revisions store only a delta against the revision before them: the HTML is
+split into tags, words and whitespace, difflib finds the runs of tokens the
+two versions share, and the delta lists those runs as [start, end] token
+ranges of the previous version with the new text in between. Deltas and
+snapshots are zlib-compressed.
+
+Every NOTULENSI_SNAPSHOT_INTERVAL revisions the full content is stored again,
+so rebuilding any revision reads at most that many rows.
+"""
+
+import re
+import json
+import zlib
+import hashlib
+from difflib import SequenceMatcher
+from flask import current_app
+from extensions import db
+from models import NotulensiRevision
+
+_TOKEN_RE = re.compile(r"<[^>]*>?|[^<\s]+|\s+")
+
+
+def tokenize(content):
+    """Split HTML into tags, words and whitespace; "".join() of the result is the input."""
+    return _TOKEN_RE.findall(content)
+
+
+def _blocks(tokens):
+    """Group tokens into blocks that each end with a closing tag, returning (text, start, end) tuples."""
+    blocks, start = [], 0
+    for i, token in enumerate(tokens):
+        if token.startswith("</"):
+            blocks.append(("".join(tokens[start:i + 1]), start, i + 1))
+            start = i + 1
+    if start < len(tokens):
+        blocks.append(("".join(tokens[start:]), start, len(tokens)))
+    return blocks
+
+
+def make_delta(old, new):
+    """
+    Delta turning `old` into `new`. Matching whole blocks first keeps the
+    token-level diff confined to the paragraphs that actually changed, which
+    is what makes this affordable on large documents.
+    """
+    old_tokens, new_tokens = tokenize(old), tokenize(new)
+    old_blocks, new_blocks = _blocks(old_tokens), _blocks(new_tokens)
+    ops = []
+
+    def copy(start, end):
+        if ops and isinstance(ops[-1], list) and ops[-1][1] == start:
+            ops[-1][1] = end
+        else:
+            ops.append([start, end])
+
+    def insert(text):
+        if ops and isinstance(ops[-1], str):
+            ops[-1] += text
+        else:
+            ops.append(text)
+
+    block_matcher = SequenceMatcher(None, [b[0] for b in old_blocks], [b[0] for b in new_blocks], autojunk=False)
+    for tag, i1, i2, j1, j2 in block_matcher.get_opcodes():
+        old_start = old_blocks[i1][1] if i1 < i2 else None
+        new_start, new_end = (new_blocks[j1][1], new_blocks[j2 - 1][2]) if j1 < j2 else (None, None)
+        if tag == "equal":
+            copy(old_start, old_blocks[i2 - 1][2])
+        elif tag == "insert":
+            insert("".join(new_tokens[new_start:new_end]))
+        elif tag == "replace":
+            old_end = old_blocks[i2 - 1][2]
+            matcher = SequenceMatcher(None, old_tokens[old_start:old_end], new_tokens[new_start:new_end],
+                                      autojunk=False)
+            for op, a1, a2, b1, b2 in matcher.get_opcodes():
+                if op == "equal":
+                    copy(old_start + a1, old_start + a2)
+                elif op in ("replace", "insert"):
+                    insert("".join(new_tokens[new_start + b1:new_start + b2]))
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def _apply(old_tokens, delta):
+    """Apply a delta to a token list, returning the new version's token list."""
+    tokens = []
+    for op in json.loads(zlib.decompress(delta)):
+        if isinstance(op, list):
+            tokens.extend(old_tokens[op[0]:op[1]])
+        else:
+            # Inserted text always consists of whole tokens of the new version
+            tokens.extend(tokenize(op))
+    return tokens
+
+
+def apply_delta(old, delta):
+    return "".join(_apply(tokenize(old), delta))
+
+
+def _hash(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _add(note_id, revision, base_revision, content, data, is_snapshot, author_id, created_at=None):
+    row = NotulensiRevision(
+        notulensi_id=note_id,
+        revision=revision,
+        base_revision=base_revision,
+        is_snapshot=is_snapshot,
+        data=data,
+        content_hash=_hash(content),
+        content_size=len(content.encode("utf-8")),
+        author_id=author_id,
+        created_at=created_at,
+    )
+    db.session.add(row)
+    return row
+
+
+def record_revision(note, previous_content, previous_saved_at=None, author_id=None):
+    """
+    Add a revision for note.content in the current transaction. The note must
+    have been flushed; previous_content is what it held before this save.
+
+    Returns the new NotulensiRevision, or None if the content didn't change.
+    """
+    content = note.content
+    last = (
+        db.session.query(NotulensiRevision.revision, NotulensiRevision.base_revision, NotulensiRevision.content_hash)
+        .filter(NotulensiRevision.notulensi_id == note.id)
+        .order_by(NotulensiRevision.revision.desc())
+        .first()
+    )
+    if last and last.content_hash == _hash(content):
+        return None
+
+    if last is None and previous_content:
+        # The note predates revision history; keep what it said before this save
+        last = _add(note.id, 1, 1, previous_content, zlib.compress(previous_content.encode("utf-8"), 9),
+                    True, None, previous_saved_at)
+
+    revision = last.revision + 1 if last else 1
+    interval = current_app.config["NOTULENSI_SNAPSHOT_INTERVAL"]
+    # Delta only against content we know the previous revision holds (content
+    # rewritten outside the editor, e.g. by backfill.py, breaks the chain)
+    if (
+        last is None
+        or not previous_content
+        or last.content_hash != _hash(previous_content)
+        or revision - last.base_revision >= interval
+    ):
+        return _add(note.id, revision, revision, content, zlib.compress(content.encode("utf-8"), 9),
+                    True, author_id)
+    return _add(note.id, revision, last.base_revision, content, make_delta(previous_content, content),
+                False, author_id)
+
+
+def get_revision_content(note_id, revision):
+    """Rebuild the HTML of one revision, or None if it doesn't exist."""
+    base_revision = (
+        db.session.query(NotulensiRevision.base_revision)
+        .filter_by(notulensi_id=note_id, revision=revision)
+        .scalar()
+    )
+    if base_revision is None:
+        return None
+
+    rows = (
+        db.session.query(NotulensiRevision.is_snapshot, NotulensiRevision.data)
+        .filter(
+            NotulensiRevision.notulensi_id == note_id,
+            NotulensiRevision.revision >= base_revision,
+            NotulensiRevision.revision <= revision,
+        )
+        .order_by(NotulensiRevision.revision)
+    )
+    tokens = []
+    for is_snapshot, data in rows:
+        tokens = tokenize(zlib.decompress(data).decode("utf-8")) if is_snapshot else _apply(tokens, data)
+    return "".join(tokens)
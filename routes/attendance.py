@@ -1,18 +1,24 @@
 from datetime import datetime, timezone, timedelta
 from io import BytesIO
-from flask import Blueprint, request, jsonify, Response
+from flask import Blueprint, request, jsonify, Response, current_app
 from routes.auth import token_required
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from docx import Document
 from extensions import db
 from models import Session, Attendance, User
-from serializers import serialize_attendance, serialize_user
-from utils import can_mark_attendance, is_core_user
+from serializers import serialize_attendance, serialize_attendance_row, serialize_user
+from utils import can_mark_attendance, is_core_user, parse_iso_date
+from attendance_buffer import get_attendance_buffer, insert_ignore_duplicates
+from pagination import get_limit, paginate
 
 bp = Blueprint("attendance", __name__)
 
 WIB = timezone(timedelta(hours=7))
 ADMIN_ROLES = {"admin", "ketua", "pembina"}
+BULK_MAX_RECORDS = 500
+ATTENDANCE_STATUSES = ("present", "absent", "excused", "late")
+HISTORY_STATUSES = ATTENDANCE_STATUSES
 
 
 def _require_admin():
@@ -21,8 +27,20 @@ def _require_admin():
         return jsonify({"success": False, "message": "Access denied"}), 403
 
 
+def _can_mark_session(user, s):
+    """Whether user may mark attendance for session s: admins, or members of one of its PICs."""
+    pic_ids = [sp.pic_id for sp in s.session_pics] or [None]
+    return any(can_mark_attendance(user, pic_id) for pic_id in pic_ids)
+
+
+def _invalid_status(status):
+    return jsonify({"success": False, "error": "invalid_data", "message": f"Invalid status: {status}"}), 400
+
+
 def _record_attendance(session_id, user_id, status, attendance_type):
     """Core insert logic shared between regular and core attendance."""
+    if status not in ATTENDANCE_STATUSES:
+        return _invalid_status(status)
     s = Session.query.get(session_id)
     if not s:
         return jsonify({"success": False, "error": "not_found", "message": "Session not found"}), 404
@@ -35,6 +53,9 @@ def _record_attendance(session_id, user_id, status, attendance_type):
     if existing:
         return jsonify({"success": False, "error": "already_marked", "message": "Attendance already recorded"}), 409
 
+    if current_app.config["ATTENDANCE_WRITE_BEHIND"]:
+        return _queue_attendance(s, user_id, status, attendance_type)
+
     att = Attendance(
         session_id=session_id,
         user_id=user_id,
@@ -54,6 +75,33 @@ def _record_attendance(session_id, user_id, status, attendance_type):
         return jsonify({"success": False, "error": "database_error", "message": str(e)}), 500
 
 
+def _queue_attendance(s, user_id, status, attendance_type):
+    """Acknowledge a validated check-in now and let the write-behind buffer insert it."""
+    row = {
+        "session_id": s.id,
+        "user_id": user_id,
+        "status": status,
+        "attendance_type": attendance_type,
+        "timestamp": datetime.now(WIB),
+    }
+    if not get_attendance_buffer().add(row):
+        return jsonify({"success": False, "error": "already_marked", "message": "Attendance already recorded"}), 409
+    return jsonify({
+        "success": True,
+        "queued": True,
+        "attendance": {
+            "id": None,
+            "session_id": s.id,
+            "session_name": s.name,
+            "session_date": s.date.isoformat(),
+            "user_id": user_id,
+            "status": status,
+            "attendance_type": attendance_type,
+            "timestamp": row["timestamp"].isoformat(),
+        },
+    }), 202
+
+
 @bp.route("/api/attendance", methods=["POST"])
 @token_required
 def api_attendance():
@@ -72,12 +120,100 @@ def api_attendance():
         return jsonify({"success": False, "error": "invalid_data", "message": "Invalid ID format"}), 400
 
     s = Session.query.get(session_id)
-    if s and not can_mark_attendance(current_user, s.pic_id):
+    if s and not _can_mark_session(current_user, s):
         return jsonify({"success": False, "error": "forbidden", "message": "No permission to mark attendance"}), 403
 
     return _record_attendance(session_id, user_id, status, "regular")
 
 
+@bp.route("/api/attendance/bulk", methods=["POST"])
+@token_required
+def api_attendance_bulk():
+    """Mark a whole class at once: validates the session once, inserts in one transaction."""
+    current_user = request.current_user
+    data = request.get_json() or {}
+    session_id = data.get("session_id")
+    records = data.get("records")
+
+    if not session_id or not isinstance(records, list) or not records:
+        return jsonify({"success": False, "error": "invalid_data", "message": "Missing required fields"}), 400
+    if len(records) > BULK_MAX_RECORDS:
+        return jsonify({
+            "success": False, "error": "invalid_data",
+            "message": f"Too many records (max {BULK_MAX_RECORDS})",
+        }), 400
+    try:
+        session_id = int(session_id)
+    except (ValueError, TypeError):
+        return jsonify({"success": False, "error": "invalid_data", "message": "Invalid ID format"}), 400
+
+    unknown = next((rec["status"] for rec in records
+                    if isinstance(rec, dict) and rec.get("status") and rec["status"] not in ATTENDANCE_STATUSES), None)
+    if unknown is not None:
+        return _invalid_status(unknown)
+
+    s = Session.query.get(session_id)
+    if not s:
+        return jsonify({"success": False, "error": "not_found", "message": "Session not found"}), 404
+    if not _can_mark_session(current_user, s):
+        return jsonify({"success": False, "error": "forbidden", "message": "No permission to mark attendance"}), 403
+    if s.is_locked:
+        return jsonify({"success": False, "error": "session_locked", "message": "Session is locked"}), 403
+
+    results = []
+    pending = {}
+    for rec in records:
+        rec = rec if isinstance(rec, dict) else {}
+        user_id, status = rec.get("user_id"), rec.get("status")
+        try:
+            user_id = int(user_id)
+        except (ValueError, TypeError):
+            results.append({"user_id": user_id, "success": False, "error": "invalid_data"})
+            continue
+        if not status:
+            results.append({"user_id": user_id, "success": False, "error": "invalid_data"})
+        elif user_id in pending:
+            results.append({"user_id": user_id, "success": False, "error": "duplicate"})
+        else:
+            result = {"user_id": user_id, "status": status}
+            pending[user_id] = result
+            results.append(result)
+
+    if pending:
+        known = {uid for (uid,) in db.session.query(User.id).filter(User.id.in_(pending))}
+        now = datetime.now(WIB)
+        rows = []
+        for user_id, result in pending.items():
+            if user_id in known:
+                rows.append({
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "status": result["status"],
+                    "attendance_type": "regular",
+                    "timestamp": now,
+                })
+            else:
+                result.update(success=False, error="user_not_found")
+
+        try:
+            inserted = insert_ignore_duplicates(rows) if rows else {}
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"success": False, "error": "database_error", "message": str(e)}), 500
+
+        for row in rows:
+            result = pending[row["user_id"]]
+            key = (row["session_id"], row["user_id"])
+            if key in inserted:
+                result.update(success=True, attendance_id=inserted[key])
+            else:
+                result.update(success=False, error="already_marked")
+
+    created = sum(1 for r in results if r["success"])
+    return jsonify({"success": True, "session_id": session_id, "created": created, "results": results})
+
+
 @bp.route("/api/attendance/core", methods=["POST"])
 @token_required
 def api_attendance_core():
@@ -105,19 +241,65 @@ def api_attendance_core():
     return _record_attendance(session_id, user_id, status, "core")
 
 
+def _attendance_history(user_id):
+    """
+    Records and per-status summary for one user, optionally limited to a
+    session date range (?from=&to=) and paginated newest-first with
+    ?limit=&cursor=. Returns (records, summary, next_cursor).
+    """
+    filters = [Attendance.user_id == user_id]
+    date_from = parse_iso_date(request.args.get("from"))
+    date_to = parse_iso_date(request.args.get("to"))
+    if date_from:
+        filters.append(Session.date >= date_from)
+    if date_to:
+        filters.append(Session.date <= date_to)
+
+    counts = dict(
+        db.session.query(Attendance.status, func.count(Attendance.id))
+        .outerjoin(Session, Attendance.session_id == Session.id)
+        .filter(*filters)
+        .group_by(Attendance.status)
+        .all()
+    )
+    summary = {status: counts.get(status, 0) for status in HISTORY_STATUSES}
+    summary["total"] = sum(counts.values())
+
+    q = (
+        db.session.query(
+            Attendance.id, Attendance.session_id, Attendance.user_id, Attendance.status,
+            Attendance.attendance_type, Attendance.timestamp,
+            Session.name.label("session_name"), Session.date.label("session_date"),
+        )
+        .outerjoin(Session, Attendance.session_id == Session.id)
+        .filter(*filters)
+    )
+
+    if get_limit() is None:
+        return q.order_by(Attendance.id).all(), summary, None
+
+    rows, next_cursor = paginate(
+        q, [Session.date, Attendance.id],
+        key=lambda r: (r.session_date, r.id),
+        descending=True,
+    )
+    return rows, summary, next_cursor
+
+
 @bp.route("/api/attendance/history")
 @token_required
 def attendance_history():
     current_user = request.current_user
-    records = Attendance.query.filter_by(user_id=current_user.id).all()
-    summary = {
-        "present": sum(1 for r in records if r.status == "present"),
-        "absent": sum(1 for r in records if r.status == "absent"),
-        "excused": sum(1 for r in records if r.status == "excused"),
-        "late": sum(1 for r in records if r.status == "late"),
-        "total": len(records),
-    }
-    return jsonify({"success": True, "records": [serialize_attendance(r) for r in records], "summary": summary})
+    try:
+        records, summary, next_cursor = _attendance_history(current_user.id)
+    except (ValueError, TypeError):
+        return jsonify({"success": False, "error": "invalid_data", "message": "Invalid cursor or date"}), 400
+    return jsonify({
+        "success": True,
+        "records": [serialize_attendance_row(r) for r in records],
+        "summary": summary,
+        "next_cursor": next_cursor,
+    })
 
 
 @bp.route("/api/attendance/history/all")
@@ -138,19 +320,16 @@ def attendance_history_for_user(user_id):
         return jsonify({"success": False, "message": "Access denied"}), 403
 
     user = User.query.get_or_404(user_id)
-    records = Attendance.query.filter_by(user_id=user_id).all()
-    summary = {
-        "present": sum(1 for r in records if r.status == "present"),
-        "absent": sum(1 for r in records if r.status == "absent"),
-        "excused": sum(1 for r in records if r.status == "excused"),
-        "late": sum(1 for r in records if r.status == "late"),
-        "total": len(records),
-    }
+    try:
+        records, summary, next_cursor = _attendance_history(user_id)
+    except (ValueError, TypeError):
+        return jsonify({"success": False, "error": "invalid_data", "message": "Invalid cursor or date"}), 400
     return jsonify({
         "success": True,
         "user": serialize_user(user),
-        "records": [serialize_attendance(r) for r in records],
+        "records": [serialize_attendance_row(r) for r in records],
         "summary": summary,
+        "next_cursor": next_cursor,
     })
 
 
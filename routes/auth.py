@@ -1,14 +1,44 @@
 import jwt
+from collections import namedtuple
 from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify, current_app
 from flask_login import logout_user, login_required, current_user
 from models import User
-from extensions import bcrypt
+from extensions import db, bcrypt
 from serializers import serialize_user
+from cache import TTLCache
+from config import Config
 from functools import wraps
 
 bp = Blueprint("auth", __name__)
 
+# The columns protected routes need about the caller. Routes that modify the
+# user load the full row themselves.
+Principal = namedtuple("Principal", ["id", "role", "pic_id", "can_mark_attendance", "name", "email"])
+
+identity_cache = TTLCache(maxsize=Config.IDENTITY_CACHE_SIZE, ttl=Config.IDENTITY_CACHE_TTL)
+
+
+def invalidate_identity(*user_ids):
+    """Drop cached principals after a user's role, PIC, permissions or existence change."""
+    for user_id in user_ids:
+        identity_cache.invalidate(user_id)
+
+
+def _load_principal(user_id):
+    principal = identity_cache.get(user_id)
+    if principal is None:
+        row = (
+            db.session.query(*(getattr(User, field) for field in Principal._fields))
+            .filter(User.id == user_id)
+            .first()
+        )
+        if not row:
+            return None
+        principal = Principal(*row)
+        identity_cache.set(user_id, principal)
+    return principal
+
 
 def token_required(f):
     @wraps(f)
@@ -18,7 +48,7 @@ def token_required(f):
             return jsonify({"success": False, "error": "unauthorized"}), 401
         try:
             data = jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=["HS256"])
-            user = User.query.get(data["user_id"])
+            user = _load_principal(data["user_id"])
             if not user:
                 return jsonify({"success": False, "error": "unauthorized"}), 401
             request.current_user = user
@@ -64,4 +94,5 @@ def logout():
 @bp.route("/api/auth/me")
 @token_required
 def me():
-    return jsonify({"success": True, "user": serialize_user(request.current_user)})
\ No newline at end of file
+    user = User.query.get_or_404(request.current_user.id)
+    return jsonify({"success": True, "user": serialize_user(user)})
\ No newline at end of file
@@ -1,16 +1,21 @@
-import os
 import logging
-from datetime import datetime, date
-from flask import Blueprint, jsonify
+from datetime import date
+from functools import lru_cache
+from flask import Blueprint, request, jsonify
+from sqlalchemy.orm import defer, undefer
 from routes.auth import token_required
-from ummalqura.hijri_date import HijriDate
+from utils import parse_iso_date
+from hijri import to_hijri, hijri_range
 from models import Session, Notulensi, Pic, SessionPIC
 from extensions import db
-from summarizer import summarize_notulensi
+from summarizer import DEFAULT_SUMMARY
+from summary_cache import get_cached_summaries, enqueue_summary
 
 bp = Blueprint("calendar", __name__)
 logger = logging.getLogger(__name__)
 
+MAX_RANGE_YEARS = 5
+
 ISLAMIC_HOLIDAYS = {
     "01-01": "Islamic New Year",
     "01-09": "Day of Tasua",
@@ -39,58 +44,74 @@ ISLAMIC_HOLIDAYS = {
 }
 
 
-def _get_hijri_date(gregorian_date_str):
+def _get_hijri_date(gregorian_date):
     try:
-        g = datetime.strptime(gregorian_date_str, "%Y-%m-%d").date()
-        h = HijriDate(g.year, g.month, g.day, gr=True)
-        return f"{h.day} {h.month_name} {h.year} H"
+        return str(to_hijri(gregorian_date))
     except Exception:
         return ""
 
 
-def _get_hijri_key(g_date):
-    h = HijriDate(g_date.year, g_date.month, g_date.day, gr=True)
-    return f"{h.month:02d}-{h.day:02d}", h
-
-
-def _plain_preview(html_content, max_len=150):
-    import re
-    from html import unescape
-    text = unescape(re.sub("<[^<]+?>", "", html_content)).strip()
-    return (text[:max_len] + "...") if len(text) > max_len else (text or "Meeting notes available.")
+@lru_cache(maxsize=32)
+def _holiday_events(year):
+    """Islamic holiday events in a Gregorian year as (date, event) pairs, computed once per process."""
+    events = []
+    try:
+        days = list(hijri_range(date(year, 1, 1), date(year, 12, 31)))
+    except ValueError:
+        logger.warning("No Hijri data for %s; skipping holidays", year)
+        return ()
+    for day, h in days:
+        if h.key in ISLAMIC_HOLIDAYS:
+            events.append((day, {
+                "title": f"{ISLAMIC_HOLIDAYS[h.key]} ({h})",
+                "start": day.isoformat(),
+                "allDay": True,
+                "backgroundColor": "#1e88e5",
+                "borderColor": "#1565c0",
+                "textColor": "#ffffff",
+                "extendedProps": {
+                    "type": "islamic_holiday",
+                    "hijri": str(h),
+                },
+            }))
+    return tuple(events)
 
 
 @bp.route("/api/calendar")
 @token_required
 def calendar_events():
+    try:
+        start = parse_iso_date(request.args.get("start"))
+        end = parse_iso_date(request.args.get("end"))
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid start or end date"}), 400
+
+    today = date.today()
+    range_start = start or date(today.year - 1, 1, 1)
+    range_end = end or date(today.year + 2, 1, 1)  # exclusive, like FullCalendar's end
+    if range_end <= range_start or range_end.year - range_start.year > MAX_RANGE_YEARS:
+        return jsonify({"success": False, "message": f"Range must span at most {MAX_RANGE_YEARS} years"}), 400
+
+    q = Session.query
+    if start:
+        q = q.filter(Session.date >= start)
+    if end:
+        q = q.filter(Session.date < end)
+
     events = []
-    for s in Session.query.all():
+    for s in q.all():
         hijri = _get_hijri_date(s.date)
         events.append({
             "title": f"{s.name} ({hijri})",
-            "start": s.date,
+            "start": s.date.isoformat(),
             "extendedProps": {"type": "rohis_session", "session_id": s.id},
         })
 
-    today = date.today()
-    current = date(today.year - 1, 1, 1)
-    end = date(today.year + 1, 12, 31)
-    while current <= end:
-        key, h = _get_hijri_key(current)
-        if key in ISLAMIC_HOLIDAYS:
-            events.append({
-                "title": f"{ISLAMIC_HOLIDAYS[key]} ({h.day} {h.month_name} {h.year} H)",
-                "start": current.isoformat(),
-                "allDay": True,
-                "backgroundColor": "#1e88e5",
-                "borderColor": "#1565c0",
-                "textColor": "#ffffff",
-                "extendedProps": {
-                    "type": "islamic_holiday",
-                    "hijri": f"{h.day} {h.month_name} {h.year} H",
-                },
-            })
-        current = current.fromordinal(current.toordinal() + 1)
+    for year in range(range_start.year, range_end.year + 1):
+        events.extend(
+            event for day, event in _holiday_events(year)
+            if range_start <= day < range_end
+        )
 
     return jsonify(events)
 
@@ -99,11 +120,11 @@ def calendar_events():
 @token_required
 def news_feed():
     try:
-        today_str = str(date.today())
-        upcoming = Session.query.filter(Session.date >= today_str).order_by(Session.date.asc()).limit(3).all()
+        upcoming = Session.query.filter(Session.date >= date.today()).order_by(Session.date.asc()).limit(3).all()
         recent = (
             db.session.query(Notulensi, Session)
             .join(Session, Notulensi.session_id == Session.id)
+            .options(defer(Notulensi.content), undefer(Notulensi.plain_text))
             .order_by(Notulensi.updated_at.desc())
             .limit(3)
             .all()
@@ -115,26 +136,26 @@ def news_feed():
             upcoming_data.append({
                 "id": s.id,
                 "name": s.name,
-                "date": s.date,
+                "date": s.date.isoformat(),
                 "pic": ", ".join(p.name for p in pics) if pics else "No PIC assigned",
             })
 
         recent_data = []
+        cached = get_cached_summaries([note for note, _ in recent])
         for note, s in recent:
-            summary = "Meeting notes available."
-            if note.content:
+            summary = cached.get(note.id)
+            if summary is None:
+                # Never wait on the LLM here: show a preview until the job lands
+                summary = note.excerpt or DEFAULT_SUMMARY
+            if note.id not in cached:
                 try:
-                    summary = (
-                        summarize_notulensi(note.content)
-                        if os.environ.get("GROQ_API_KEY")
-                        else _plain_preview(note.content)
-                    )
+                    enqueue_summary(note)
                 except Exception:
-                    summary = _plain_preview(note.content)
+                    logger.exception("Failed to queue summary for notulensi %s", note.id)
             recent_data.append({
                 "id": s.id,
                 "session_name": s.name,
-                "session_date": s.date,
+                "session_date": s.date.isoformat(),
                 "summary": summary,
                 "updated_at": (note.updated_at or note.created_at).strftime("%d %b %Y"),
             })
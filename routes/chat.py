@@ -1,11 +1,21 @@
+import json
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from routes.auth import token_required
-from ai import call_chatbot_groq
+from ai import call_chatbot_groq, stream_chatbot_groq
+from chat_cache import answer_cache, normalize_question
 
 bp = Blueprint("chat", __name__)
 logger = logging.getLogger(__name__)
 
+ADMIN_ROLES = {"admin", "ketua", "pembina"}
+
+
+def _require_admin():
+    current_user = request.current_user
+    if current_user.role not in ADMIN_ROLES:
+        return jsonify({"success": False, "message": "Access denied"}), 403
+
 
 @bp.route("/api/chat", methods=["POST"])
 @token_required
@@ -22,3 +32,101 @@ def chat():
         reply = {"action": "chat", "message": "Error occurred. Please try again."}
 
     return jsonify({"reply": reply})
+
+
+@bp.route("/api/chat/stream", methods=["POST"])
+@token_required
+def chat_stream():
+    """
+    Same as /api/chat, but the answer is sent as Server-Sent Events while
+    Groq produces it: "token" events carry text, "navigate" a redirect,
+    "error" a fallback message, and "done" ends a successful reply.
+    """
+    data = request.get_json() or {}
+    message = data.get("message", "").strip()
+    if not message:
+        return jsonify({"reply": {"action": "chat", "message": "Please type a question."}}), 400
+
+    def events():
+        try:
+            for event, payload in stream_chatbot_groq(message):
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        except Exception as e:
+            logger.error("Chatbot stream error: %s", e)
+            yield f"event: error\ndata: {json.dumps({'message': 'Error occurred. Please try again.'})}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        # Stop proxies (nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Cached answers live in each worker's memory, so these act on the worker
+# that serves the request.
+
+@bp.route("/api/chat/cache")
+@token_required
+def chat_cache_status():
+    err = _require_admin()
+    if err:
+        return err
+    pinned = [
+        {"question": key, "reply": reply}
+        for key, reply in sorted(answer_cache.pinned().items())
+    ]
+    return jsonify({"success": True, "stats": answer_cache.stats(), "pinned": pinned})
+
+
+@bp.route("/api/chat/cache/pin", methods=["POST"])
+@token_required
+def pin_chat_answer():
+    err = _require_admin()
+    if err:
+        return err
+
+    data = request.get_json() or {}
+    question = data.get("question", "").strip()
+    answer = data.get("answer", "").strip()
+    if not question or not answer:
+        return jsonify({"success": False, "error": "invalid_data", "message": "Question and answer are required"}), 400
+
+    key = normalize_question(question)
+    answer_cache.pin(key, {"action": "chat", "message": answer})
+    return jsonify({"success": True, "question": key})
+
+
+@bp.route("/api/chat/cache/pin", methods=["DELETE"])
+@token_required
+def unpin_chat_answer():
+    err = _require_admin()
+    if err:
+        return err
+
+    data = request.get_json() or {}
+    question = data.get("question", "").strip()
+    if not question:
+        return jsonify({"success": False, "error": "invalid_data", "message": "Question is required"}), 400
+
+    key = normalize_question(question)
+    if not answer_cache.unpin(key):
+        return jsonify({"success": False, "error": "not_found", "message": "No pinned answer for this question"}), 404
+    return jsonify({"success": True, "question": key})
+
+
+@bp.route("/api/chat/cache/purge", methods=["POST"])
+@token_required
+def purge_chat_cache():
+    """Drop one cached answer (with a question) or all of them; pinned answers stay."""
+    err = _require_admin()
+    if err:
+        return err
+
+    data = request.get_json() or {}
+    question = data.get("question", "").strip()
+    if question:
+        answer_cache.invalidate(normalize_question(question))
+    else:
+        answer_cache.clear()
+    return jsonify({"success": True, "stats": answer_cache.stats()})
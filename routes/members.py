@@ -1,11 +1,12 @@
 import csv
 from io import TextIOWrapper, StringIO
 from flask import Blueprint, request, jsonify
-from routes.auth import token_required
+from routes.auth import token_required, invalidate_identity
 from sqlalchemy.exc import IntegrityError
 from extensions import db, bcrypt
 from models import User
 from serializers import serialize_user
+from pagination import paginate
 
 bp = Blueprint("members", __name__)
 
@@ -21,8 +22,15 @@ def _require_admin():
 @bp.route("/api/members")
 @token_required
 def list_members():
-    users = User.query.order_by(User.name).all()
-    return jsonify({"success": True, "members": [serialize_user(u) for u in users]})
+    try:
+        users, next_cursor = paginate(User.query, [User.name, User.id], key=lambda u: (u.name, u.id))
+    except ValueError:
+        return jsonify({"success": False, "error": "invalid_data", "message": "Invalid cursor"}), 400
+    return jsonify({
+        "success": True,
+        "members": [serialize_user(u) for u in users],
+        "next_cursor": next_cursor,
+    })
 
 
 @bp.route("/api/members", methods=["POST"])
@@ -128,8 +136,10 @@ def batch_delete_members():
     deleted, failed = 0, []
     for u in users_to_delete:
         try:
+            user_id = u.id
             db.session.delete(u)
             db.session.commit()
+            invalidate_identity(user_id)
             deleted += 1
         except Exception:
             db.session.rollback()
@@ -155,6 +165,7 @@ def delete_member(user_id):
     try:
         db.session.delete(user)
         db.session.commit()
+        invalidate_identity(user_id)
         return jsonify({"success": True, "message": "Member deleted"})
     except Exception as e:
         db.session.rollback()
@@ -180,6 +191,7 @@ def change_member_role(user_id):
 
     user.role = new_role
     db.session.commit()
+    invalidate_identity(user.id)
     return jsonify({"success": True, "message": "Role updated", "member": serialize_user(user)})
 
 
@@ -206,6 +218,7 @@ def assign_member_pic(user_id):
         message = f"PIC assignment removed from {user.name}"
 
     db.session.commit()
+    invalidate_identity(user.id)
     return jsonify({"success": True, "message": message, "member": serialize_user(user)})
 
 
@@ -224,6 +237,7 @@ def toggle_attendance_permission(user_id):
         user.can_mark_attendance = not user.can_mark_attendance
 
     db.session.commit()
+    invalidate_identity(user.id)
     return jsonify({
         "success": True,
         "can_mark_attendance": user.can_mark_attendance,
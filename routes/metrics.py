@@ -0,0 +1,30 @@
+from flask import Blueprint, request, jsonify
+from routes.auth import token_required, identity_cache
+from chat_cache import answer_cache
+from groq_client import groq_breaker
+
+bp = Blueprint("metrics", __name__)
+
+ADMIN_ROLES = {"admin", "ketua", "pembina"}
+
+
+def _require_admin():
+    current_user = request.current_user
+    if current_user.role not in ADMIN_ROLES:
+        return jsonify({"success": False, "message": "Access denied"}), 403
+
+
+@bp.route("/api/metrics")
+@token_required
+def metrics():
+    """Counters for this worker's in-process caches and its Groq circuit breaker."""
+    err = _require_admin()
+    if err:
+        return err
+
+    return jsonify({
+        "success": True,
+        "identity_cache": identity_cache.stats(),
+        "chat_cache": answer_cache.stats(),
+        "groq_circuit": groq_breaker.stats(),
+    })
@@ -1,13 +1,26 @@
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, abort
+from sqlalchemy.exc import IntegrityError
 from routes.auth import token_required
 from extensions import db
-from models import Session, Notulensi
-from serializers import serialize_session, serialize_notulensi
+from models import Session, Notulensi, NotulensiImage, NotulensiRevision, User
+from serializers import serialize_session, serialize_notulensi, serialize_notulensi_index_row, serialize_revision
+from summary_cache import enqueue_summary
+from pagination import paginate
+from search import search, index_note, remove_note
+from notulensi_images import extract_images
+from revisions import record_revision, get_revision_content
 
 bp = Blueprint("notulensi", __name__)
 
 ADMIN_ROLES = {"admin", "ketua", "pembina"}
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 50
+# Unique constraints that two admins saving the same notulensi at once can
+# violate; any other IntegrityError is a real error
+CONFLICT_CONSTRAINTS = ("ix_notulensi_session_id", "unique_notulensi_revision")
+CONFLICT_COLUMNS = ("notulensi.session_id", "notulensi_revision.notulensi_id")
+CONFLICT_MESSAGE = "Notulensi was just changed by someone else, please reload"
 
 
 def _require_admin():
@@ -16,22 +29,93 @@ def _require_admin():
         return jsonify({"success": False, "message": "Access denied"}), 403
 
 
+def _save_content(note, content):
+    """
+    Store new HTML for a note (new or existing): extract inline images,
+    refresh the derived columns and search entry, and record a revision.
+    The caller commits.
+    """
+    # A new note isn't complete yet; storing the images must not flush it
+    with db.session.no_autoflush:
+        content, _ = extract_images(content)
+    previous_content, previous_saved_at = note.content, note.updated_at or note.created_at
+    note.set_content(content)
+    if note.id is not None:
+        note.updated_at = datetime.utcnow()
+    db.session.flush()
+    index_note(note.id, note.plain_text)
+    return record_revision(note, previous_content, previous_saved_at, author_id=request.current_user.id)
+
+
+def _is_save_conflict(error):
+    """Whether an IntegrityError came from a concurrent save of the same notulensi."""
+    constraint = getattr(getattr(error.orig, "diag", None), "constraint_name", None)
+    if constraint:
+        return constraint in CONFLICT_CONSTRAINTS
+    # SQLite only reports the columns: "UNIQUE constraint failed: notulensi.session_id"
+    message = str(error.orig)
+    return message.startswith("UNIQUE") and any(column in message for column in CONFLICT_COLUMNS)
+
+
 @bp.route("/api/notulensi")
 @token_required
 def list_notulensi():
-    sessions = Session.query.order_by(Session.date.desc()).all()
-    notes = {n.session_id: n for n in Notulensi.query.all()}
-    result = [
+    # Metadata only; the HTML body is served by get_notulensi
+    q = (
+        db.session.query(
+            Session.id, Session.name, Session.date,
+            Notulensi.id.label("notulensi_id"), Notulensi.excerpt, Notulensi.word_count, Notulensi.content_size,
+            Notulensi.created_at, Notulensi.updated_at,
+        )
+        .outerjoin(Notulensi, Notulensi.session_id == Session.id)
+    )
+    try:
+        rows, next_cursor = paginate(
+            q, [Session.date, Session.id],
+            key=lambda r: (r.date, r.id),
+            descending=True,
+        )
+    except ValueError:
+        return jsonify({"success": False, "error": "invalid_data", "message": "Invalid cursor"}), 400
+    return jsonify({
+        "success": True,
+        "items": [serialize_notulensi_index_row(r) for r in rows],
+        "next_cursor": next_cursor,
+    })
+
+
+@bp.route("/api/notulensi/search")
+@token_required
+def search_notulensi():
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"success": False, "error": "invalid_data", "message": "Search query is required"}), 400
+    limit = min(request.args.get("limit", SEARCH_DEFAULT_LIMIT, type=int), SEARCH_MAX_LIMIT)
+    if limit < 1:
+        limit = SEARCH_DEFAULT_LIMIT
+
+    hits = search(q, limit=limit)
+    sessions = {}
+    if hits:
+        sessions = {
+            row.id: row
+            for row in db.session.query(Notulensi.id, Notulensi.session_id, Session.name, Session.date)
+            .join(Session, Session.id == Notulensi.session_id)
+            .filter(Notulensi.id.in_([note_id for note_id, _, _ in hits]))
+        }
+    results = [
         {
-            "session_id": s.id,
-            "session_name": s.name,
-            "session_date": s.date,
-            "has_notulensi": s.id in notes,
-            "notulensi": serialize_notulensi(notes[s.id]) if s.id in notes else None,
+            "notulensi_id": note_id,
+            "session_id": sessions[note_id].session_id,
+            "session_name": sessions[note_id].name,
+            "session_date": sessions[note_id].date.isoformat(),
+            "rank": rank,
+            "snippet": snippet,
         }
-        for s in sessions
+        # Skip index entries whose note was removed with its session
+        for note_id, rank, snippet in hits if note_id in sessions
     ]
-    return jsonify({"success": True, "items": result})
+    return jsonify({"success": True, "query": q, "results": results})
 
 
 @bp.route("/api/notulensi/<int:session_id>", methods=["GET"])
@@ -61,14 +145,91 @@ def save_notulensi(session_id):
         return jsonify({"success": False, "message": "Content cannot be empty"}), 400
 
     note = Notulensi.query.filter_by(session_id=session_id).first()
-    if note:
-        note.content = content
-        note.updated_at = datetime.utcnow()
-    else:
-        note = Notulensi(session_id=session_id, content=content)
+    if not note:
+        note = Notulensi(session_id=session_id)
         db.session.add(note)
 
-    db.session.commit()
+    try:
+        _save_content(note, content)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if not _is_save_conflict(e):
+            raise
+        # Another admin created or saved this notulensi at the same time
+        return jsonify({"success": False, "message": CONFLICT_MESSAGE}), 409
+    enqueue_summary(note)
+    return jsonify({"success": True, "notulensi": serialize_notulensi(note)})
+
+
+@bp.route("/api/notulensi/images/<string:sha256>")
+def serve_notulensi_image(sha256):
+    # Public like profile pictures (<img> tags can't send the token); the
+    # URL is the image's SHA-256, so it can't be guessed
+    sha256 = sha256.lower()
+    mimetype = db.session.query(NotulensiImage.mimetype).filter(NotulensiImage.sha256 == sha256).scalar()
+    if not mimetype:
+        abort(404)
+
+    if sha256 in request.if_none_match:
+        response = Response(status=304)
+    else:
+        data = db.session.query(NotulensiImage.data).filter(NotulensiImage.sha256 == sha256).scalar()
+        response = Response(data, mimetype=mimetype)
+    response.set_etag(sha256)
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    return response
+
+
+@bp.route("/api/notulensi/by-id/<int:notulensi_id>/revisions")
+@token_required
+def list_revisions(notulensi_id):
+    Notulensi.query.get_or_404(notulensi_id)
+    rows = (
+        db.session.query(
+            NotulensiRevision.revision, NotulensiRevision.is_snapshot, NotulensiRevision.content_size,
+            NotulensiRevision.author_id, NotulensiRevision.created_at, User.name.label("author_name"),
+        )
+        .outerjoin(User, User.id == NotulensiRevision.author_id)
+        .filter(NotulensiRevision.notulensi_id == notulensi_id)
+        .order_by(NotulensiRevision.revision.desc())
+        .all()
+    )
+    return jsonify({"success": True, "revisions": [serialize_revision(r) for r in rows]})
+
+
+@bp.route("/api/notulensi/by-id/<int:notulensi_id>/revisions/<int:revision>")
+@token_required
+def get_revision(notulensi_id, revision):
+    content = get_revision_content(notulensi_id, revision)
+    if content is None:
+        return jsonify({"success": False, "error": "not_found", "message": "Revision not found"}), 404
+    return jsonify({"success": True, "notulensi_id": notulensi_id, "revision": revision, "content": content})
+
+
+@bp.route("/api/notulensi/by-id/<int:notulensi_id>/revisions/<int:revision>/restore", methods=["POST"])
+@token_required
+def restore_revision(notulensi_id, revision):
+    err = _require_admin()
+    if err:
+        return err
+
+    note = Notulensi.query.get_or_404(notulensi_id)
+    content = get_revision_content(notulensi_id, revision)
+    if content is None:
+        return jsonify({"success": False, "error": "not_found", "message": "Revision not found"}), 404
+
+    # Restoring adds a new revision; history is never rewritten
+    try:
+        _save_content(note, content)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if not _is_save_conflict(e):
+            raise
+        return jsonify({"success": False, "message": CONFLICT_MESSAGE}), 409
+    enqueue_summary(note)
     return jsonify({"success": True, "notulensi": serialize_notulensi(note)})
 
 
@@ -80,6 +241,7 @@ def delete_notulensi(notulensi_id):
         return err
 
     note = Notulensi.query.get_or_404(notulensi_id)
+    remove_note(note.id)
     db.session.delete(note)
     db.session.commit()
     return jsonify({"success": True, "message": "Notulensi deleted"})
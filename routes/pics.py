@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from routes.auth import token_required
+from routes.auth import token_required, invalidate_identity
 from extensions import db
 from models import Pic, SessionPIC
 from serializers import serialize_pic
@@ -52,10 +52,12 @@ def delete_pic(pic_id):
         return err
 
     pic = Pic.query.get_or_404(pic_id)
+    member_ids = [user.id for user in pic.members]
     for user in pic.members:
         user.pic_id = None
         user.can_mark_attendance = False
     SessionPIC.query.filter_by(pic_id=pic_id).delete()
     db.session.delete(pic)
     db.session.commit()
+    invalidate_identity(*member_ids)
     return jsonify({"success": True, "message": f"PIC '{pic.name}' deleted"})
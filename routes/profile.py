@@ -1,45 +1,88 @@
 import os
-from flask import Blueprint, request, jsonify, Response
-from routes.auth import token_required
+import hashlib
+from functools import lru_cache
+from flask import Blueprint, request, jsonify, Response, abort
+from routes.auth import token_required, invalidate_identity
 from werkzeug.utils import secure_filename
 from extensions import db, bcrypt
-from models import User
-from serializers import serialize_user
+from models import User, ProfilePictureVariant
+from thumbnails import enqueue_variants, pick_size
+from serializers import serialize_user, profile_picture_url, DEFAULT_PICTURE_VERSION
 
 bp = Blueprint("profile", __name__)
 
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "webp"}
+PICTURE_MIMETYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+DEFAULT_PICTURE_PATH = os.path.join("static", "uploads", "profiles", "default.png")
 
 
 def _allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def _picture_mimetype(filename):
+    filename = filename or "image.png"
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else "png"
+    return PICTURE_MIMETYPES.get(ext, "image/png")
+
+
+@lru_cache(maxsize=1)
+def _default_picture():
+    """Read the default avatar once per process. Returns (bytes, etag) or None."""
+    if not os.path.exists(DEFAULT_PICTURE_PATH):
+        return None
+    with open(DEFAULT_PICTURE_PATH, "rb") as f:
+        data = f.read()
+    return data, f"default-{hashlib.sha256(data).hexdigest()[:16]}"
+
+
+def _cacheable(response, etag, version):
+    """Mark a picture response cacheable; URLs carrying the current version never change."""
+    response.set_etag(etag)
+    if version and request.args.get("v") == version:
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 @bp.route("/api/profile", methods=["PUT"])
 @token_required
 def update_profile():
-    current_user = request.current_user
+    current_user = User.query.get_or_404(request.current_user.id)
     data = request.get_json() or {}
-    username = data.get("username", "").strip()
+    # "username" is what older clients send for the display name
+    name = (data.get("name") or data.get("username") or "").strip()
+    email = (data.get("email") or "").strip().lower()
     password = data.get("password", "")
 
-    if username:
-        existing = User.query.filter_by(username=username).first()
+    if name:
+        current_user.name = name
+
+    if email:
+        existing = User.query.filter_by(email=email).first()
         if existing and existing.id != current_user.id:
-            return jsonify({"success": False, "message": "Username already taken"}), 409
-        current_user.username = username
+            return jsonify({"success": False, "message": "Email already taken"}), 409
+        current_user.email = email
 
     if password:
         current_user.password = bcrypt.generate_password_hash(password).decode("utf-8")
 
     db.session.commit()
+    # token_required caches the caller's name and email
+    invalidate_identity(current_user.id)
     return jsonify({"success": True, "message": "Profile updated", "user": serialize_user(current_user)})
 
 
 @bp.route("/api/profile/password", methods=["PUT"])
 @token_required
 def change_password():
-    current_user = request.current_user
+    current_user = User.query.get_or_404(request.current_user.id)
     data = request.get_json() or {}
     old_password = data.get("old_password", "")
     new_password = data.get("new_password", "")
@@ -61,7 +104,7 @@ def change_password():
 @bp.route("/api/profile/picture", methods=["POST"])
 @token_required
 def upload_pfp():
-    current_user = request.current_user
+    current_user = User.query.get_or_404(request.current_user.id)
     file = request.files.get("pfp")
     if not file or not file.filename:
         return jsonify({"success": False, "message": "No file provided"}), 400
@@ -74,32 +117,68 @@ def upload_pfp():
     if size > 5 * 1024 * 1024:
         return jsonify({"success": False, "message": "File too large (max 5 MB)"}), 400
 
-    current_user.profile_picture_data = file.read()
+    data = file.read()
+    current_user.profile_picture_data = data
+    current_user.profile_picture_hash = hashlib.sha256(data).hexdigest()
     current_user.profile_picture_filename = secure_filename(file.filename)
     db.session.commit()
+    enqueue_variants(current_user.id, current_user.profile_picture_hash)
     return jsonify({
         "success": True,
         "message": "Profile picture updated",
-        "url": f"/api/profile/picture/{current_user.id}",
+        "url": profile_picture_url(current_user),
     })
 
 
+def _serve_variant(user_id, source_hash, size):
+    """Response for a generated thumbnail, or None if it doesn't exist for the current picture."""
+    variant_id = (
+        db.session.query(ProfilePictureVariant.id)
+        .filter_by(user_id=user_id, size=size, source_hash=source_hash)
+        .scalar()
+    )
+    if not variant_id:
+        return None
+    etag = f"{source_hash}-{size}"
+    if etag in request.if_none_match:
+        return _cacheable(Response(status=304), etag, source_hash)
+    data = db.session.query(ProfilePictureVariant.data).filter_by(id=variant_id).scalar()
+    return _cacheable(Response(data, mimetype="image/webp"), etag, source_hash)
+
+
 @bp.route("/api/profile/picture/<int:user_id>")
 def serve_profile_picture(user_id):
-    user = User.query.get_or_404(user_id)
-    if user.profile_picture_data:
-        filename = user.profile_picture_filename or "image.png"
-        ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else "png"
-        mime = {
-            "png": "image/png",
-            "jpg": "image/jpeg",
-            "jpeg": "image/jpeg",
-            "webp": "image/webp",
-        }.get(ext, "image/png")
-        return Response(user.profile_picture_data, mimetype=mime)
-
-    default = os.path.join("static", "uploads", "profiles", "default.png")
-    if os.path.exists(default):
-        with open(default, "rb") as f:
-            return Response(f.read(), mimetype="image/png")
+    user = (
+        db.session.query(User.profile_picture_hash, User.profile_picture_filename)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if not user:
+        abort(404)
+
+    size = request.args.get("size", type=int)
+    if user.profile_picture_hash and size:
+        variant = _serve_variant(user_id, user.profile_picture_hash, pick_size(size))
+        if variant:
+            return variant
+        # Not generated yet (or predates thumbnails): fall back to the original
+        enqueue_variants(user_id, user.profile_picture_hash)
+
+    if user.profile_picture_hash:
+        # A sized URL switches to the thumbnail once it exists, so don't pin the original there
+        version = None if size else user.profile_picture_hash
+        # Answer revalidation from the hash column alone, without touching the BLOB
+        if user.profile_picture_hash in request.if_none_match:
+            return _cacheable(Response(status=304), user.profile_picture_hash, version)
+        data = db.session.query(User.profile_picture_data).filter(User.id == user_id).scalar()
+        if data:
+            response = Response(data, mimetype=_picture_mimetype(user.profile_picture_filename))
+            return _cacheable(response, user.profile_picture_hash, version)
+
+    default = _default_picture()
+    if default:
+        data, etag = default
+        if etag in request.if_none_match:
+            return _cacheable(Response(status=304), etag, DEFAULT_PICTURE_VERSION)
+        return _cacheable(Response(data, mimetype="image/png"), etag, DEFAULT_PICTURE_VERSION)
     return jsonify({"error": "not_found"}), 404
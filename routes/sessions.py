@@ -1,5 +1,10 @@
+from collections import defaultdict
 from flask import Blueprint, request, jsonify
+from sqlalchemy import func
 from routes.auth import token_required
+from utils import parse_iso_date
+from pagination import get_limit, paginate
+from search import remove_note
 from extensions import db
 from models import Session, Attendance, Notulensi, SessionPIC, Pic
 from serializers import serialize_session, serialize_attendance
@@ -19,11 +24,58 @@ def _require_admin():
 @token_required
 def list_sessions():
     session_type = request.args.get("type")
-    q = Session.query
+    try:
+        date_from = parse_iso_date(request.args.get("from"))
+        date_to = parse_iso_date(request.args.get("to"))
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid from or to date"}), 400
+
+    counts = (
+        db.session.query(Attendance.session_id, func.count(Attendance.id).label("attendance_count"))
+        .group_by(Attendance.session_id)
+        .subquery()
+    )
+    q = (
+        db.session.query(Session, func.coalesce(counts.c.attendance_count, 0))
+        .outerjoin(counts, counts.c.session_id == Session.id)
+    )
+    pics_q = (
+        db.session.query(SessionPIC.session_id, Pic.id, Pic.name)
+        .join(Pic, Pic.id == SessionPIC.pic_id)
+    )
+    filters = []
     if session_type:
-        q = q.filter_by(session_type=session_type)
-    sessions = q.order_by(Session.date.desc()).all()
-    return jsonify({"success": True, "sessions": [serialize_session(s) for s in sessions]})
+        filters.append(Session.session_type == session_type)
+    if date_from:
+        filters.append(Session.date >= date_from)
+    if date_to:
+        filters.append(Session.date <= date_to)
+    if filters:
+        q = q.filter(*filters)
+        pics_q = pics_q.join(Session, Session.id == SessionPIC.session_id).filter(*filters)
+    try:
+        rows, next_cursor = paginate(
+            q, [Session.date, Session.id],
+            key=lambda r: (r[0].date, r[0].id),
+            descending=True,
+        )
+    except ValueError:
+        return jsonify({"success": False, "error": "invalid_data", "message": "Invalid cursor"}), 400
+    if get_limit() is not None:
+        pics_q = pics_q.filter(SessionPIC.session_id.in_([s.id for s, _ in rows]))
+
+    pics_by_session = defaultdict(list)
+    for pic in pics_q.order_by(SessionPIC.id):
+        pics_by_session[pic.session_id].append(pic)
+
+    return jsonify({
+        "success": True,
+        "sessions": [
+            serialize_session(s, attendance_count=count, pics=pics_by_session[s.id])
+            for s, count in rows
+        ],
+        "next_cursor": next_cursor,
+    })
 
 
 @bp.route("/api/sessions", methods=["POST"])
@@ -41,6 +93,10 @@ def create_session():
 
     if not name or not date_val:
         return jsonify({"success": False, "message": "Name and date are required"}), 400
+    try:
+        date_val = parse_iso_date(date_val)
+    except ValueError:
+        return jsonify({"success": False, "message": "Date must be in YYYY-MM-DD format"}), 400
     if session_type not in ("all", "core", "event"):
         session_type = "all"
 
@@ -66,6 +122,8 @@ def delete_session(session_id):
     try:
         SessionPIC.query.filter_by(session_id=session_id).delete()
         Attendance.query.filter_by(session_id=session_id).delete()
+        for (note_id,) in db.session.query(Notulensi.id).filter_by(session_id=session_id):
+            remove_note(note_id)
         Notulensi.query.filter_by(session_id=session_id).delete()
         db.session.delete(s)
         db.session.commit()
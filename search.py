@@ -0,0 +1,147 @@
+"""
+Full-text search over notulensi.
+
+Each note's stored plain text (Notulensi.plain_text) is kept in a search
+index that is updated in the same transaction as the note itself (see
+index_note / remove_note).
+
+- PostgreSQL: the notulensi_search table (created by migration) stores the
+  text and its tsvector under a GIN index; results are ranked with
+  ts_rank_cd and snippets come from ts_headline.
+- SQLite (local and test runs): an FTS5 virtual table, created and filled
+  from the notulensi table the first time it is needed; ranked with bm25.
+
+Snippets are highlighted with sentinel characters inside the database, then
+HTML-escaped and turned into <mark> tags here, so note text can never inject
+markup into the results.
+"""
+
+import re
+import html
+from sqlalchemy import text
+from extensions import db
+from models import Notulensi
+from utils import html_to_plain_text
+
+TS_CONFIG = "simple"  # Postgres ships no Indonesian stemmer; match words as written
+SNIPPET_WORDS = 24
+# Private-use characters that never appear in note text
+MARK_START, MARK_END = "\ue000", "\ue001"
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+_sqlite_ready = False
+
+
+def _strip_marks(plain_text):
+    return (plain_text or "").replace(MARK_START, "").replace(MARK_END, "")
+
+
+def search_text(content):
+    """The text indexed for a note's HTML content."""
+    return _strip_marks(html_to_plain_text(content))
+
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+def _ensure_sqlite_index():
+    global _sqlite_ready
+    if _sqlite_ready:
+        return
+    exists = db.session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notulensi_fts'"
+    )).first()
+    if not exists:
+        db.session.execute(text(
+            "CREATE VIRTUAL TABLE notulensi_fts USING fts5(body, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        rebuild_index()
+    _sqlite_ready = True
+
+
+def rebuild_index():
+    """Re-index every note. Runs in the caller's transaction."""
+    if _dialect() == "postgresql":
+        db.session.execute(text("DELETE FROM notulensi_search"))
+    else:
+        db.session.execute(text("DELETE FROM notulensi_fts"))
+    for note_id, plain_text in db.session.query(Notulensi.id, Notulensi.plain_text).yield_per(200):
+        _write(note_id, _strip_marks(plain_text))
+
+
+def _write(note_id, body):
+    if _dialect() == "postgresql":
+        db.session.execute(text(
+            "INSERT INTO notulensi_search (notulensi_id, body, document) "
+            "VALUES (:id, :body, to_tsvector(:config, :body)) "
+            "ON CONFLICT (notulensi_id) DO UPDATE "
+            "SET body = excluded.body, document = excluded.document"
+        ), {"id": note_id, "body": body, "config": TS_CONFIG})
+    else:
+        db.session.execute(text("DELETE FROM notulensi_fts WHERE rowid = :id"), {"id": note_id})
+        db.session.execute(text("INSERT INTO notulensi_fts (rowid, body) VALUES (:id, :body)"),
+                           {"id": note_id, "body": body})
+
+
+def index_note(note_id, plain_text):
+    """Add or refresh a note in the search index. New notes must have been flushed."""
+    if _dialect() != "postgresql":
+        _ensure_sqlite_index()
+    _write(note_id, _strip_marks(plain_text))
+
+
+def remove_note(note_id):
+    if _dialect() == "postgresql":
+        db.session.execute(text("DELETE FROM notulensi_search WHERE notulensi_id = :id"), {"id": note_id})
+    else:
+        _ensure_sqlite_index()
+        db.session.execute(text("DELETE FROM notulensi_fts WHERE rowid = :id"), {"id": note_id})
+
+
+def highlight(snippet):
+    """HTML-escape a raw snippet and turn its sentinels into <mark> tags."""
+    return html.escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+def search(query, limit=20):
+    """
+    Notes matching every word in `query`, best first.
+
+    Returns a list of (notulensi_id, rank, snippet_html); a higher rank is a
+    better match.
+    """
+    terms = _TERM_RE.findall(query.lower())
+    if not terms:
+        return []
+
+    if _dialect() == "postgresql":
+        rows = db.session.execute(text(
+            "SELECT hit.notulensi_id, hit.rank, ts_headline(:config, s.body, hit.query, :options) "
+            "FROM ("
+            "  SELECT notulensi_id, query, ts_rank_cd(document, query) AS rank"
+            "  FROM notulensi_search, plainto_tsquery(:config, :q) AS query"
+            "  WHERE document @@ query"
+            "  ORDER BY rank DESC LIMIT :limit"
+            ") AS hit JOIN notulensi_search s ON s.notulensi_id = hit.notulensi_id "
+            "ORDER BY hit.rank DESC"
+        ), {
+            "config": TS_CONFIG,
+            "q": " ".join(terms),
+            "limit": limit,
+            "options": f"StartSel={MARK_START}, StopSel={MARK_END}, "
+                       f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, MaxFragments=2",
+        }).all()
+    else:
+        _ensure_sqlite_index()
+        # Quote each term so FTS5 query syntax in user input is matched literally
+        match = " ".join(f'"{t}"' for t in terms)
+        rows = db.session.execute(text(
+            "SELECT rowid, -bm25(notulensi_fts), "
+            "snippet(notulensi_fts, 0, :start, :end, '...', :words) "
+            "FROM notulensi_fts WHERE notulensi_fts MATCH :match "
+            "ORDER BY bm25(notulensi_fts) LIMIT :limit"
+        ), {"match": match, "start": MARK_START, "end": MARK_END,
+            "words": SNIPPET_WORDS, "limit": limit}).all()
+
+    return [(note_id, round(float(rank), 4), highlight(snippet)) for note_id, rank, snippet in rows]
@@ -1,6 +1,13 @@
 from datetime import timezone, timedelta
 
 WIB = timezone(timedelta(hours=7))
+DEFAULT_PICTURE_VERSION = "default"
+
+
+def profile_picture_url(user):
+    """Avatar URL versioned by content hash, so clients can cache it forever."""
+    version = user.profile_picture_hash or DEFAULT_PICTURE_VERSION
+    return f"/api/profile/picture/{user.id}?v={version}"
 
 
 def serialize_user(user, include_email=True):
@@ -13,24 +20,32 @@ def serialize_user(user, include_email=True):
         "must_change_password": user.must_change_password,
         "pic_id": user.pic_id,
         "pic_name": user.pic.name if user.pic else None,
-        "profile_picture_url": f"/api/profile/picture/{user.id}",
+        "profile_picture_url": profile_picture_url(user),
     }
     if include_email:
         data["email"] = user.email
     return data
 
 
-def serialize_session(s):
+def serialize_session(s, attendance_count=None, pics=None):
+    """
+    Pass attendance_count and pics (list of objects with id/name) when they
+    were loaded in bulk, to avoid a lazy load per session.
+    """
+    if pics is None:
+        pics = s.assigned_pics
+    if attendance_count is None:
+        attendance_count = len(s.attendances)
     return {
         "id": s.id,
         "name": s.name,
-        "date": s.date,
+        "date": s.date.isoformat() if s.date else None,
         "is_locked": s.is_locked,
         "session_type": s.session_type,
         "description": s.description,
         "created_at": s.created_at.isoformat() if s.created_at else None,
-        "assigned_pics": [{"id": p.id, "name": p.name} for p in s.assigned_pics],
-        "attendance_count": len(s.attendances),
+        "assigned_pics": [{"id": p.id, "name": p.name} for p in pics],
+        "attendance_count": attendance_count,
     }
 
 
@@ -50,7 +65,7 @@ def serialize_attendance(att):
         "id": att.id,
         "session_id": att.session_id,
         "session_name": att.session.name if att.session else None,
-        "session_date": att.session.date if att.session else None,
+        "session_date": att.session.date.isoformat() if att.session else None,
         "user_id": att.user_id,
         "status": att.status,
         "attendance_type": att.attendance_type,
@@ -58,13 +73,59 @@ def serialize_attendance(att):
     }
 
 
+def serialize_attendance_row(row):
+    """Same shape as serialize_attendance, for rows already joined with the session name and date."""
+    return {
+        "id": row.id,
+        "session_id": row.session_id,
+        "session_name": row.session_name,
+        "session_date": row.session_date.isoformat() if row.session_date else None,
+        "user_id": row.user_id,
+        "status": row.status,
+        "attendance_type": row.attendance_type,
+        "timestamp": row.timestamp.astimezone(WIB).isoformat() if row.timestamp else None,
+    }
+
+
+def serialize_notulensi_index_row(row):
+    """Index entry for a session row outer-joined with its notulensi metadata (no content)"""
+    has_notulensi = row.notulensi_id is not None
+    return {
+        "session_id": row.id,
+        "session_name": row.name,
+        "session_date": row.date.isoformat(),
+        "has_notulensi": has_notulensi,
+        "notulensi": {
+            "id": row.notulensi_id,
+            "excerpt": row.excerpt,
+            "word_count": row.word_count,
+            "content_size": row.content_size,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+        } if has_notulensi else None,
+    }
+
+
+def serialize_revision(row):
+    """Revision metadata row (NotulensiRevision columns plus author_name)"""
+    return {
+        "revision": row.revision,
+        "is_snapshot": row.is_snapshot,
+        "content_size": row.content_size,
+        "author_id": row.author_id,
+        "author_name": row.author_name,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    }
+
+
 def serialize_notulensi(note):
     return {
         "id": note.id,
         "session_id": note.session_id,
         "session_name": note.session.name if note.session else None,
-        "session_date": note.session.date if note.session else None,
+        "session_date": note.session.date.isoformat() if note.session else None,
         "content": note.content,
+        "word_count": note.word_count,
         "created_at": note.created_at.isoformat() if note.created_at else None,
         "updated_at": note.updated_at.isoformat() if note.updated_at else None,
     }
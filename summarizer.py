@@ -1,7 +1,5 @@
-import os
-import re
-from html import unescape
-from groq import Groq
+import hashlib
+from groq_client import APIKeyError, CircuitOpenError, get_groq_client, groq_breaker
 from dotenv import load_dotenv
 load_dotenv()
 SUMMARIZER_PROMPT = """
@@ -23,84 +21,45 @@ Example input: "Meeting discussed Ramadan program planning. Decided to have ifta
 Example output: "Discussed Ramadan program planning. Team will organize iftar gathering on March 15th, with Ahmad coordinating logistics. Fundraising ideas proposed for new prayer mats."
 """
 
+DEFAULT_SUMMARY = "Meeting notes available."
 
-class APIKeyError(Exception):
-    """Raised when API key is missing or invalid"""
-    pass
 
-
-def get_groq_client():
-    """
-    Get Groq client with proper error handling.
-    
-    Raises:
-        APIKeyError: If GROQ_API_KEY is not set in environment
-    """
-    api_key = os.environ.get("GROQ_API_KEY")
-    
-    if not api_key:
-        raise APIKeyError(
-            "GROQ_API_KEY environment variable is not set. "
-            "Please set it in your .env file or environment variables."
-        )
-    
-    if not api_key.strip():
-        raise APIKeyError(
-            "GROQ_API_KEY is empty. Please provide a valid API key."
-        )
-    
-    try:
-        return Groq(api_key=api_key)
-    except Exception as e:
-        raise APIKeyError(f"Failed to initialize Groq client: {str(e)}")
-
-
-def clean_html(content: str) -> str:
+def generate_summary(text: str) -> str:
     """
-    Remove HTML tags and decode HTML entities.
+    Summarize notulensi text into 2-3 sentences using AI.
     
-    Args:
-        content: HTML content string
-        
-    Returns:
-        Clean text without HTML
-    """
-    # Strip HTML tags
-    clean_text = re.sub('<[^<]+?>', '', content)
-    # Decode HTML entities
-    clean_text = unescape(clean_text).strip()
-    return clean_text
-
-
-def summarize_notulensi(content: str) -> str:
-    """
-    Summarize notulensi content into 2-3 sentences using AI.
+    Unlike summarize_notulensi, API failures are raised so callers
+    (e.g. background jobs) can retry them.
     
     Args:
-        content: HTML content from notulensi
+        text: Plain text of the notulensi (Notulensi.plain_text)
         
     Returns:
         Brief summary string (2-3 sentences)
+        
+    Raises:
+        APIKeyError: If GROQ_API_KEY is not configured
+        CircuitOpenError: If recent Groq calls kept failing (see groq_client.py)
+        Exception: Any error raised by the Groq API call
     """
-    if not content or not content.strip():
-        return "Meeting notes available."
+    if not text or not text.strip():
+        return DEFAULT_SUMMARY
     
-    try:
-        # Clean HTML from content
-        clean_text = clean_html(content)
-        
-        # If content is too short after cleaning, return default
-        if len(clean_text) < 50:
-            return "Meeting notes available."
-        
-        # Truncate if too long (to save tokens and costs)
-        if len(clean_text) > 2000:
-            clean_text = clean_text[:2000] + "..."
-        
-        # Get Groq client
-        client = get_groq_client()
-        
-        # Generate summary
+    clean_text = text.strip()
+    
+    # If content is too short, return default
+    if len(clean_text) < 50:
+        return DEFAULT_SUMMARY
+    
+    # Truncate if too long (to save tokens and costs)
+    if len(clean_text) > 2000:
+        clean_text = clean_text[:2000] + "..."
+    
+    # Get Groq client
+    client = get_groq_client()
+    
+    # Generate summary
+    with groq_breaker.guard():
         completion = client.chat.completions.create(
             model="llama-3.1-8b-instant",
             messages=[
@@ -110,35 +69,68 @@ def summarize_notulensi(content: str) -> str:
             temperature=0.3,
             max_tokens=150,
         )
+    
+    summary = completion.choices[0].message.content.strip()
+    
+    # Validate summary length (should be reasonable)
+    if len(summary) < 10 or len(summary) > 500:
+        print(f"Warning: Summary length unusual ({len(summary)} chars)")
+        return DEFAULT_SUMMARY
         
-        summary = completion.choices[0].message.content.strip()
+    return summary
+
+
+def summarize_notulensi(text: str) -> str:
+    """
+    Summarize notulensi text, falling back to a default message on errors.
+    
+    Args:
+        text: Plain text of the notulensi (Notulensi.plain_text)
         
-        # Validate summary length (should be reasonable)
-        if len(summary) < 10 or len(summary) > 500:
-            print(f"Warning: Summary length unusual ({len(summary)} chars)")
-            return "Meeting notes available."
-            
-        return summary
+    Returns:
+        Brief summary string (2-3 sentences)
+    """
+    try:
+        return generate_summary(text)
     
     except APIKeyError as e:
         # API key not configured
         print(f"API Key Error in summarizer: {e}")
-        return "Meeting notes available."
+        return DEFAULT_SUMMARY
+    
+    except CircuitOpenError as e:
+        # Groq has been failing; skip the call until the breaker probes again
+        print(f"Summarizer skipped: {e}")
+        return DEFAULT_SUMMARY
     
     except Exception as e:
         # Any other error
         print(f"Summarization error: {type(e).__name__}: {e}")
-        return "Meeting notes available."
+        return DEFAULT_SUMMARY
+
+
+def get_content_hash(content: str) -> str:
+    """
+    Hash notulensi text so a stored summary can be matched to its source.
+    
+    Args:
+        content: Plain text of the notulensi (Notulensi.plain_text)
+        
+    Returns:
+        Hex SHA-256 digest of the content
+    """
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
 
 
-def get_summary_cache_key(notulensi_id: int) -> str:
+def get_summary_cache_key(notulensi_id: int, content_hash: str) -> str:
     """
     Generate cache key for notulensi summary.
     
     Args:
         notulensi_id: ID of the notulensi record
+        content_hash: Hash of the content the summary was generated from
         
     Returns:
         Cache key string
     """
-    return f"notulensi_summary_{notulensi_id}"
\ No newline at end of file
+    return f"notulensi_summary_{notulensi_id}_{content_hash}"
@@ -0,0 +1,174 @@
+"""
+Persistent store for AI-generated notulensi summaries.
+
+Summaries are kept in the database so every gunicorn worker shares them and
+they survive restarts. Each row is keyed by the notulensi id plus a hash of
+the plain text it was generated from, so a summary is only regenerated after
+the minutes themselves change. A row without a summary marks content the LLM
+could not summarize; it is retried only after its retry_after, which backs
+off with each failure, so the feed does not call Groq on every page view.
+
+Summaries are generated by background jobs (see enqueue_summary); request
+handlers only ever read from the store.
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import Notulensi, NotulensiSummary
+from summarizer import APIKeyError, DEFAULT_SUMMARY, generate_summary, get_content_hash, get_summary_cache_key
+from tasks import submit
+
+logger = logging.getLogger(__name__)
+
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def get_cached_summaries(notes):
+    """
+    Look up fresh summaries for a batch of notes in a single query.
+
+    Returns a dict of {notulensi_id: summary}. Notes whose last attempt failed
+    map to None until their retry time passes; notes that need a new job
+    (never summarized, content changed since, or retry due) are left out.
+    """
+    keys = {get_summary_cache_key(n.id, get_content_hash(n.plain_text)): n.id for n in notes}
+    if not keys:
+        return {}
+    rows = NotulensiSummary.query.filter(NotulensiSummary.cache_key.in_(keys)).all()
+    now = datetime.utcnow()
+    return {keys[r.cache_key]: r.summary for r in rows if r.summary is not None or r.retry_after > now}
+
+
+def _summary_row(notulensi_id, content_hash):
+    """The note's row for this content, dropping rows for older content."""
+    cache_key = get_summary_cache_key(notulensi_id, content_hash)
+    NotulensiSummary.query.filter(
+        NotulensiSummary.notulensi_id == notulensi_id,
+        NotulensiSummary.cache_key != cache_key,
+    ).delete(synchronize_session=False)
+    row = NotulensiSummary.query.filter_by(cache_key=cache_key).first()
+    if not row:
+        row = NotulensiSummary(notulensi_id=notulensi_id, cache_key=cache_key,
+                               content_hash=content_hash, failures=0)
+        db.session.add(row)
+    return row
+
+
+def store_summary(notulensi_id, content_hash, summary):
+    """Save a summary for the given content, replacing any stale ones for the note."""
+    try:
+        row = _summary_row(notulensi_id, content_hash)
+        if row.summary is None:
+            row.summary = summary
+            row.failures = 0
+            row.retry_after = None
+        db.session.commit()
+    except IntegrityError:
+        # Another worker stored the same summary first
+        db.session.rollback()
+    except Exception:
+        db.session.rollback()
+        logger.exception("Failed to store summary for notulensi %s", notulensi_id)
+
+
+def record_failure(notulensi_id, content_hash):
+    """
+    Remember that the given content could not be summarized.
+
+    The next attempt is allowed after SUMMARY_FAILURE_BACKOFF seconds,
+    doubling with each further failure up to SUMMARY_FAILURE_MAX_BACKOFF.
+    """
+    try:
+        row = _summary_row(notulensi_id, content_hash)
+        if row.summary is not None:
+            return
+        row.failures = (row.failures or 0) + 1
+        delay = min(
+            current_app.config["SUMMARY_FAILURE_BACKOFF"] * 2 ** (row.failures - 1),
+            current_app.config["SUMMARY_FAILURE_MAX_BACKOFF"],
+        )
+        row.retry_after = datetime.utcnow() + timedelta(seconds=delay)
+        db.session.commit()
+    except IntegrityError:
+        # Another worker recorded the same content first
+        db.session.rollback()
+    except Exception:
+        db.session.rollback()
+        logger.exception("Failed to record summary failure for notulensi %s", notulensi_id)
+
+
+def enqueue_summary(note):
+    """
+    Schedule a background job to summarize the note's current content.
+
+    Returns True if a job was queued, False if summaries are disabled or a
+    job for the same content is already pending in this worker.
+    """
+    if not os.environ.get("GROQ_API_KEY") or not note.plain_text:
+        return False
+
+    cache_key = get_summary_cache_key(note.id, get_content_hash(note.plain_text))
+    with _pending_lock:
+        if cache_key in _pending:
+            return False
+        _pending.add(cache_key)
+
+    try:
+        submit(_refresh_summary, note.id, cache_key)
+    except Exception:
+        with _pending_lock:
+            _pending.discard(cache_key)
+        raise
+    return True
+
+
+def _refresh_summary(notulensi_id, cache_key):
+    try:
+        note = Notulensi.query.get(notulensi_id)
+        if not note:
+            return
+        content_hash = get_content_hash(note.plain_text)
+        if get_summary_cache_key(note.id, content_hash) != cache_key:
+            # Content was edited again since this job was queued; a newer job owns it
+            return
+        row = NotulensiSummary.query.filter_by(cache_key=cache_key).first()
+        if row and (row.summary is not None or row.retry_after > datetime.utcnow()):
+            return
+        text = note.plain_text
+        # Don't hold a pooled connection while waiting on the LLM
+        db.session.close()
+
+        max_attempts = current_app.config["SUMMARY_MAX_ATTEMPTS"]
+        backoff = current_app.config["SUMMARY_RETRY_BACKOFF"]
+        for attempt in range(1, max_attempts + 1):
+            try:
+                summary = generate_summary(text)
+                break
+            except APIKeyError as e:
+                logger.warning("Skipping summary for notulensi %s: %s", notulensi_id, e)
+                return
+            except Exception as e:
+                if attempt == max_attempts:
+                    logger.error("Summary for notulensi %s failed after %d attempts: %s", notulensi_id, attempt, e)
+                    record_failure(notulensi_id, content_hash)
+                    return
+                delay = backoff * 2 ** (attempt - 1)
+                logger.warning("Summary attempt %d for notulensi %s failed (%s), retrying in %.1fs",
+                               attempt, notulensi_id, e, delay)
+                time.sleep(delay)
+
+        if summary == DEFAULT_SUMMARY:
+            # Too short or the output was rejected; the feed keeps the excerpt
+            record_failure(notulensi_id, content_hash)
+        else:
+            store_summary(notulensi_id, content_hash, summary)
+    finally:
+        with _pending_lock:
+            _pending.discard(cache_key)
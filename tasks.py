@@ -0,0 +1,42 @@
+"""
+Background task pool.
+
+Slow work such as LLM calls is submitted here instead of running inside the
+request. Each job runs in its own app context and releases its database
+session when it finishes.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bg-task")
+        return _executor
+
+
+def submit(fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) on the worker pool inside the current app's context."""
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                logger.exception("Background task %s failed", fn.__name__)
+            finally:
+                db.session.remove()
+
+    return _get_executor(app.config["BACKGROUND_WORKERS"]).submit(run)
@@ -0,0 +1,54 @@
+"""
+Microbenchmark for hijri.py against ummalqura.HijriDate.
+
+Converts a set of single dates, and a whole year as a range, both ways and
+prints the time per date.
+
+Usage:
+    python tests/bench_hijri.py [--dates N] [--repeat N]
+"""
+
+import os
+import sys
+import random
+import argparse
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ummalqura.hijri_date import HijriDate  # noqa: E402
+from hijri import MAX_DATE, MIN_DATE, hijri_range, to_hijri  # noqa: E402
+
+
+def per_date(fn, count, repeat):
+    """Best time per date, in microseconds, over `repeat` runs."""
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hijri conversion microbenchmark")
+    parser.add_argument("--dates", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    span = (MAX_DATE - MIN_DATE).days
+    days = [MIN_DATE + timedelta(days=rng.randrange(span + 1)) for _ in range(args.dates)]
+    year = (date(2026, 1, 1), date(2026, 12, 31))
+    year_days = [year[0] + timedelta(days=i) for i in range((year[1] - year[0]).days + 1)]
+
+    results = [
+        ("single dates, ummalqura", per_date(lambda: [HijriDate(d.year, d.month, d.day, gr=True) for d in days],
+                                              len(days), args.repeat)),
+        ("single dates, hijri.py", per_date(lambda: [to_hijri(d) for d in days], len(days), args.repeat)),
+        ("one year, ummalqura", per_date(lambda: [HijriDate(d.year, d.month, d.day, gr=True) for d in year_days],
+                                          len(year_days), args.repeat)),
+        ("one year, hijri_range", per_date(lambda: list(hijri_range(*year)), len(year_days), args.repeat)),
+    ]
+    for name, micros in results:
+        print(f"{name:>24}: {micros:8.2f} us/date")
+
+
+if __name__ == "__main__":
+    main()
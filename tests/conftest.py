@@ -0,0 +1,95 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import jwt
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop("GROQ_API_KEY", None)
+
+# app.py builds its module-level app on import, so it needs a database URL
+# before anything imports it
+from config import Config  # noqa: E402
+
+Config.SQLALCHEMY_DATABASE_URI = "sqlite://"
+Config.SQLALCHEMY_ENGINE_OPTIONS = {}
+
+import search  # noqa: E402
+from app import create_app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import User  # noqa: E402
+from routes.auth import identity_cache  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    test_config = type("TestConfig", (Config,), {
+        "TESTING": True,
+        "SECRET_KEY": "test-secret-key-that-is-long-enough",
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+    })
+    app = create_app(test_config)
+    with app.app_context():
+        db.create_all()
+        identity_cache.clear()
+        search._sqlite_ready = False
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def foreign_keys(app):
+    """SQLite only enforces foreign keys when asked to, per connection."""
+    def enable(dbapi_connection, _):
+        dbapi_connection.execute("PRAGMA foreign_keys = ON")
+
+    event.listen(db.engine, "connect", enable)
+    db.session.remove()
+    db.engine.dispose()
+    yield
+    event.remove(db.engine, "connect", enable)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements run inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def make_user(name="Admin", email="admin@example.com", role="admin", **fields):
+    user = User(name=name, email=email, role=role, password="x", **fields)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def auth_header(app, user):
+    token = jwt.encode({"user_id": user.id}, app.config["SECRET_KEY"], algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def admin(app):
+    return make_user()
+
+
+@pytest.fixture
+def admin_headers(app, admin):
+    return auth_header(app, admin)
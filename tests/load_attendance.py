@@ -0,0 +1,134 @@
+"""
+Load test for check-in bursts on /api/attendance.
+
+Runs the app on a local threaded server twice, once writing each check-in
+directly and once with ATTENDANCE_WRITE_BEHIND, and fires a burst of
+concurrent check-ins at it. Reports acknowledged check-ins per second,
+request latency, and how long until every row is actually stored.
+
+Usage:
+    python tests/load_attendance.py [--checkins N] [--concurrency N] [--pool-size N]
+                                    [--database-url URL]
+
+Without --database-url a temporary SQLite file is used. Pass a scratch
+Postgres URL to measure against the real pool; its tables are created and
+dropped by the script.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import requests
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import Config, auth_header, create_app, db, make_user  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from attendance_buffer import get_attendance_buffer  # noqa: E402
+import attendance_buffer  # noqa: E402
+from models import Attendance, Session, User  # noqa: E402
+
+
+def build_app(database_url, pool_size, write_behind):
+    engine_options = {} if database_url.startswith("sqlite") else {
+        "pool_size": pool_size, "max_overflow": 0, "pool_pre_ping": True,
+    }
+    config = type("LoadTestConfig", (Config,), {
+        "SECRET_KEY": "load-test-secret-key-that-is-long-enough",
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "SQLALCHEMY_ENGINE_OPTIONS": engine_options,
+        "ATTENDANCE_WRITE_BEHIND": write_behind,
+    })
+    return create_app(config)
+
+
+def run(database_url, pool_size, write_behind, checkins, concurrency):
+    app = build_app(database_url, pool_size, write_behind)
+    attendance_buffer._buffer = None
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        headers = auth_header(app, make_user())
+        db.session.execute(insert(User), [
+            {"name": f"Member {i}", "email": f"m{i}@example.com", "role": "member", "password": "x"}
+            for i in range(checkins)
+        ])
+        s = Session(name="Kajian", date=date.today())
+        db.session.add(s)
+        db.session.commit()
+        session_id = s.id
+        user_ids = [id_ for (id_,) in db.session.query(User.id).filter(User.role == "member")]
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/api/attendance"
+    local = threading.local()
+
+    def check_in(user_id):
+        if not hasattr(local, "http"):
+            local.http = requests.Session()
+        started = time.perf_counter()
+        response = local.http.post(url, headers=headers,
+                                   json={"session_id": session_id, "user_id": user_id, "status": "present"})
+        return response.status_code, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(check_in, user_ids))
+    acknowledged = time.perf_counter() - started
+
+    with app.app_context():
+        if write_behind:
+            get_attendance_buffer().close()
+        stored_after = time.perf_counter() - started
+        stored = Attendance.query.count()
+        db.session.remove()
+        db.drop_all()
+    server.shutdown()
+
+    latencies = sorted(latency for _, latency in results)
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    return {
+        "mode": "write-behind" if write_behind else "direct",
+        "statuses": statuses,
+        "acknowledged_per_second": checkins / acknowledged,
+        "stored_per_second": stored / stored_after,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "stored": stored,
+    }
+
+
+def main():
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="Check-in burst load test")
+    parser.add_argument("--checkins", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'load.db')}"
+        print(f"{args.checkins} check-ins, {args.concurrency} concurrent clients, "
+              f"{database_url.split(':')[0]} (pool {args.pool_size})\n")
+        for write_behind in (False, True):
+            r = run(database_url, args.pool_size, write_behind, args.checkins, args.concurrency)
+            print(f"{r['mode']:>12}: {r['acknowledged_per_second']:7.0f} acknowledged/s  "
+                  f"{r['stored_per_second']:7.0f} stored/s  p50 {r['p50_ms']:6.1f} ms  "
+                  f"p95 {r['p95_ms']:6.1f} ms  stored {r['stored']}  statuses {r['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
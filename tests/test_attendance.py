@@ -0,0 +1,140 @@
+from datetime import date
+
+import pytest
+
+from conftest import auth_header, make_user
+from extensions import db
+from models import Attendance, Pic, Session, SessionPIC
+
+
+def test_bulk_attendance_reports_each_record(app, client, admin_headers):
+    s = Session(name="Kajian", date=date(2026, 1, 5))
+    db.session.add(s)
+    db.session.commit()
+    members = [make_user(name=f"Member {i}", email=f"m{i}@example.com", role="member").id for i in range(3)]
+    db.session.add(Attendance(session_id=s.id, user_id=members[0], status="present"))
+    db.session.commit()
+
+    response = client.post("/api/attendance/bulk", headers=admin_headers, json={
+        "session_id": s.id,
+        "records": [
+            {"user_id": members[0], "status": "present"},
+            {"user_id": members[1], "status": "late"},
+            {"user_id": members[2], "status": "present"},
+            {"user_id": members[2], "status": "absent"},
+            {"user_id": 999, "status": "present"},
+        ],
+    })
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body["created"] == 2
+    assert [(r["user_id"], r["success"], r.get("error")) for r in body["results"]] == [
+        (members[0], False, "already_marked"),
+        (members[1], True, None),
+        (members[2], True, None),
+        (members[2], False, "duplicate"),
+        (999, False, "user_not_found"),
+    ]
+    created = {a.user_id: a.id for a in Attendance.query.filter(Attendance.user_id.in_(members[1:]))}
+    assert body["results"][1]["attendance_id"] == created[members[1]]
+
+
+def test_mark_attendance(app, client, admin_headers):
+    s = Session(name="Kajian", date=date(2026, 1, 5))
+    db.session.add(s)
+    db.session.commit()
+    member = make_user(name="Member", email="member@example.com", role="member")
+
+    response = client.post("/api/attendance", headers=admin_headers,
+                           json={"session_id": s.id, "user_id": member.id, "status": "present"})
+    assert response.status_code == 201
+    assert response.get_json()["attendance"]["user_id"] == member.id
+
+    response = client.post("/api/attendance", headers=admin_headers,
+                           json={"session_id": s.id, "user_id": member.id, "status": "present"})
+    assert response.status_code == 409
+
+
+def test_members_cannot_mark_attendance(app, client):
+    s = Session(name="Kajian", date=date(2026, 1, 5))
+    db.session.add(s)
+    db.session.commit()
+    member = make_user(name="Member", email="member@example.com", role="member")
+
+    response = client.post("/api/attendance", headers=auth_header(app, member),
+                           json={"session_id": s.id, "user_id": member.id, "status": "present"})
+    assert response.status_code == 403
+
+
+def test_pic_members_mark_their_own_sessions(app, client):
+    own, other = Pic(name="Dakwah"), Pic(name="Kebersihan")
+    s = Session(name="Kajian", date=date(2026, 1, 5))
+    db.session.add_all([own, other, s])
+    db.session.flush()
+    db.session.add(SessionPIC(session_id=s.id, pic_id=own.id))
+    db.session.commit()
+    member = make_user(name="Member", email="member@example.com", role="member")
+    pic_member = make_user(name="PIC", email="pic@example.com", role="member", pic_id=own.id)
+    outsider = make_user(name="Outsider", email="outsider@example.com", role="member", pic_id=other.id)
+
+    response = client.post("/api/attendance", headers=auth_header(app, outsider),
+                           json={"session_id": s.id, "user_id": member.id, "status": "present"})
+    assert response.status_code == 403
+    response = client.post("/api/attendance", headers=auth_header(app, pic_member),
+                           json={"session_id": s.id, "user_id": member.id, "status": "present"})
+    assert response.status_code == 201
+
+
+@pytest.fixture
+def pic_session(app):
+    pic = Pic(name="Dakwah")
+    s = Session(name="Kajian", date=date(2026, 1, 5))
+    db.session.add_all([pic, s])
+    db.session.flush()
+    db.session.add(SessionPIC(session_id=s.id, pic_id=pic.id))
+    db.session.commit()
+    return s.id, pic.id
+
+
+@pytest.mark.parametrize("fields", [{"role": "ketua"}, {"role": "member", "can_mark_attendance": True}])
+def test_bulk_uses_the_same_session_permission(app, client, pic_session, fields):
+    session_id, _ = pic_session
+    member = make_user(name="Member", email="member@example.com", role="member")
+    user = make_user(name="Other", email="other@example.com", **fields)
+    payload = {"session_id": session_id, "user_id": member.id, "status": "present"}
+
+    assert client.post("/api/attendance", headers=auth_header(app, user), json=payload).status_code == 403
+    response = client.post("/api/attendance/bulk", headers=auth_header(app, user), json={
+        "session_id": session_id, "records": [{"user_id": member.id, "status": "present"}],
+    })
+    assert response.status_code == 403
+    assert Attendance.query.count() == 0
+
+
+def test_pic_members_bulk_mark_their_own_sessions(app, client, pic_session):
+    session_id, pic_id = pic_session
+    member = make_user(name="Member", email="member@example.com", role="member")
+    pic_member = make_user(name="PIC", email="pic@example.com", role="member", pic_id=pic_id)
+
+    response = client.post("/api/attendance/bulk", headers=auth_header(app, pic_member), json={
+        "session_id": session_id, "records": [{"user_id": member.id, "status": "excused"}],
+    })
+    assert response.status_code == 200
+    assert response.get_json()["created"] == 1
+
+
+def test_unknown_status_is_rejected(app, client, admin_headers, pic_session):
+    session_id, _ = pic_session
+    member = make_user(name="Member", email="member@example.com", role="member")
+    other = make_user(name="Other", email="other@example.com", role="member")
+
+    response = client.post("/api/attendance", headers=admin_headers,
+                           json={"session_id": session_id, "user_id": member.id, "status": "asleep"})
+    assert response.status_code == 400
+    response = client.post("/api/attendance/bulk", headers=admin_headers, json={
+        "session_id": session_id,
+        "records": [{"user_id": member.id, "status": "present"}, {"user_id": other.id, "status": "asleep"}],
+    })
+    assert response.status_code == 400
+    assert Attendance.query.count() == 0
@@ -0,0 +1,97 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import attendance_buffer
+from attendance_buffer import AttendanceWriteBuffer, insert_ignore_duplicates
+from conftest import make_user
+from extensions import db
+from models import Attendance, Session
+
+
+@pytest.fixture
+def sessions(app):
+    rows = [Session(name=f"Kajian {i}", date=date(2026, 1, 5 + i)) for i in range(2)]
+    db.session.add_all(rows)
+    db.session.commit()
+    return [s.id for s in rows]
+
+
+@pytest.fixture
+def members(app):
+    return [make_user(name=f"Member {i}", email=f"m{i}@example.com", role="member").id for i in range(3)]
+
+
+@pytest.fixture
+def buffer(app):
+    # A long interval so only explicit flush() calls write
+    buffer = AttendanceWriteBuffer(app, flush_interval_ms=60_000, max_rows=1000)
+    yield buffer
+    buffer.close()
+
+
+def row(session_id, user_id):
+    return {
+        "session_id": session_id,
+        "user_id": user_id,
+        "status": "present",
+        "attendance_type": "regular",
+        "timestamp": datetime(2026, 1, 5, 7, 0),
+    }
+
+
+def test_insert_ignore_duplicates_keys_by_session_and_user(app, sessions, members):
+    first, second = sessions
+    user = members[0]
+    inserted = insert_ignore_duplicates([row(first, user), row(second, user)])
+    db.session.commit()
+    assert set(inserted) == {(first, user), (second, user)}
+
+    inserted = insert_ignore_duplicates([row(first, user), row(first, members[1])])
+    db.session.commit()
+    assert set(inserted) == {(first, members[1])}
+
+
+def test_flush_counts_same_user_in_two_sessions(buffer, sessions, members):
+    for session_id in sessions:
+        assert buffer.add(row(session_id, members[0]))
+    assert buffer.flush() == 2
+    assert Attendance.query.count() == 2
+
+
+def test_flush_keeps_arrival_order(buffer, sessions, members):
+    for user_id in reversed(members):
+        buffer.add(row(sessions[0], user_id))
+    buffer.flush()
+    ids = [a.user_id for a in Attendance.query.order_by(Attendance.id)]
+    assert ids == list(reversed(members))
+
+
+def test_failed_row_does_not_drop_the_batch(buffer, sessions, members, foreign_keys):
+    buffer.add(row(sessions[0], members[0]))
+    buffer.add(row(999, members[1]))
+    buffer.add(row(sessions[1], members[2]))
+
+    assert buffer.flush() == 2
+    written = {(a.session_id, a.user_id) for a in Attendance.query}
+    assert written == {(sessions[0], members[0]), (sessions[1], members[2])}
+    assert buffer.flush() == 0
+    # The dropped row no longer blocks a new check-in for the same key
+    assert buffer.add(row(999, members[1]))
+
+
+def test_rows_are_kept_while_database_is_unavailable(buffer, sessions, members, monkeypatch):
+    def unavailable(rows):
+        raise OperationalError("INSERT", {}, Exception("could not connect to server"))
+
+    for user_id in members:
+        buffer.add(row(sessions[0], user_id))
+    monkeypatch.setattr(attendance_buffer, "insert_ignore_duplicates", unavailable)
+    assert buffer.flush() == 0
+    assert Attendance.query.count() == 0
+    assert not buffer.add(row(sessions[0], members[0]))
+
+    monkeypatch.undo()
+    assert buffer.flush() == 3
+    assert Attendance.query.count() == 3
@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import ai
+import groq_client
+from chat_cache import answer_cache, normalize_question
+from groq_client import groq_breaker
+
+
+class FakeCompletions:
+    def __init__(self, content=None, error=None):
+        self.content = content
+        self.error = error
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def fake_client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    answer_cache.clear()
+    yield
+    answer_cache.clear()
+
+
+def test_normalize_question_ignores_case_punctuation_and_stopwords():
+    assert normalize_question("How many rakaat is Dhuhr?") == normalize_question("how many  rakaat dhuhr")
+    assert normalize_question("Tolong jelaskan, apa yang membatalkan puasa?") == "apa membatalkan puasa"
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Who is my PIC?", "Who is your PIC?"),
+    ("What can I eat at sahur?", "What can you eat at sahur?"),
+    ("Can we pray at school?", "Pray at school?"),
+    ("Tell me about zakat", "Tell me zakat"),
+    ("Kapan saya piket?", "Kapan kita piket?"),
+    ("Berapa rakaat sholat ini?", "Berapa rakaat sholat itu?"),
+])
+def test_questions_that_differ_in_meaningful_words_do_not_share_answers(monkeypatch, first, second):
+    assert normalize_question(first) != normalize_question(second)
+    completions = FakeCompletions(content="First answer.")
+    monkeypatch.setattr(ai, "get_chat_client", lambda: fake_client(completions))
+    assert ai.call_chatbot_groq(first)["message"] == "First answer."
+
+    completions.content = "Second answer."
+    assert ai.call_chatbot_groq(second)["message"] == "Second answer."
+    assert completions.calls == 2
+
+
+def test_cache_hit_does_not_touch_the_network(monkeypatch):
+    completions = FakeCompletions(content="Dhuhr has four rakaat.")
+    monkeypatch.setattr(ai, "get_chat_client", lambda: fake_client(completions))
+    first = ai.call_chatbot_groq("How many rakaat is Dhuhr?")
+    assert first == {"action": "chat", "message": "Dhuhr has four rakaat."}
+    assert completions.calls == 1
+
+    def no_network():
+        raise AssertionError("Groq client requested on a cache hit")
+
+    failing = FakeCompletions(error=ConnectionError("network is down"))
+    monkeypatch.setattr(ai, "get_chat_client", lambda: fake_client(failing))
+    assert ai.call_chatbot_groq("how many rakaat dhuhr") == first
+    assert failing.calls == 0
+
+    monkeypatch.setattr(ai, "get_chat_client", no_network)
+    events = list(ai.stream_chatbot_groq("HOW MANY RAKAAT IS DHUHR"))
+    assert events == [("token", {"text": "Dhuhr has four rakaat."}), ("done", {"action": "chat"})]
+    assert answer_cache.stats()["hits"] == 2
+
+
+def test_errors_are_not_cached(monkeypatch):
+    failing = FakeCompletions(error=ConnectionError("network is down"))
+    monkeypatch.setattr(ai, "get_chat_client", lambda: fake_client(failing))
+    reply = ai.call_chatbot_groq("what breaks the fast")
+    assert reply["message"] == ai.ERROR_MESSAGE
+
+    completions = FakeCompletions(content="Eating or drinking on purpose.")
+    monkeypatch.setattr(ai, "get_chat_client", lambda: fake_client(completions))
+    assert ai.call_chatbot_groq("what breaks the fast")["message"] == "Eating or drinking on purpose."
+    assert completions.calls == 1
+
+
+@pytest.fixture
+def unreachable_groq(app, monkeypatch):
+    """A real shared client whose every request fails to connect."""
+    attempts = []
+
+    def refuse(request):
+        attempts.append(request.url.path)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    class RefusingClient(httpx.Client):
+        def __init__(self, **kwargs):
+            super().__init__(transport=httpx.MockTransport(refuse), **kwargs)
+
+    monkeypatch.setattr(groq_client.httpx, "Client", RefusingClient)
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(groq_client, "_client", None)
+    groq_breaker.record_success()
+    yield attempts
+    groq_breaker.record_success()
+
+
+def test_chat_attempts_are_not_retried(app, unreachable_groq):
+    assert app.config["GROQ_MAX_RETRIES"] > 0
+    assert ai.call_chatbot_groq("what breaks the fast")["message"] == ai.ERROR_MESSAGE
+    assert len(unreachable_groq) == 1
+    assert groq_breaker.stats()["failures"] == 1
+
+    events = list(ai.stream_chatbot_groq("how long is tarawih"))
+    assert events[-1][0] == "error"
+    assert len(unreachable_groq) == 2
+    assert groq_breaker.stats()["failures"] == 2
+    assert groq_client.get_groq_client().max_retries == app.config["GROQ_MAX_RETRIES"]
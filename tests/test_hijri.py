@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+
+import pytest
+from ummalqura.hijri_date import HijriDate
+
+from extensions import db
+from hijri import MAX_DATE, MIN_DATE, hijri_range, to_hijri
+from models import Session
+from routes import calendar
+
+
+def reference(day):
+    h = HijriDate(day.year, day.month, day.day, gr=True)
+    return int(h.year), int(h.month), int(h.day), int(h.month_len)
+
+
+def test_range_matches_ummalqura_over_whole_table():
+    mismatches = [
+        (day, tuple(hijri), reference(day))
+        for day, hijri in hijri_range(MIN_DATE, MAX_DATE)
+        if tuple(hijri) != reference(day)
+    ]
+    assert mismatches == []
+
+
+def test_single_dates_match_ummalqura():
+    day = MIN_DATE
+    while day <= MAX_DATE:
+        assert tuple(to_hijri(day)) == reference(day)
+        day += timedelta(days=97)
+    assert tuple(to_hijri(MAX_DATE)) == reference(MAX_DATE)
+
+
+def test_range_yields_every_day():
+    start, end = MIN_DATE, MAX_DATE
+    days = [day for day, _ in hijri_range(start, end)]
+    assert len(days) == (end - start).days + 1
+    assert days[0] == start and days[-1] == end
+
+
+@pytest.mark.parametrize("day", [MIN_DATE - timedelta(days=1), MAX_DATE + timedelta(days=1)])
+def test_dates_outside_table_raise(day):
+    with pytest.raises(ValueError):
+        to_hijri(day)
+    with pytest.raises(ValueError):
+        list(hijri_range(MIN_DATE, day) if day > MAX_DATE else hijri_range(day, MAX_DATE))
+
+
+def test_calendar_never_builds_hijri_dates(client, admin_headers, monkeypatch):
+    # HijriDate scans its whole month table per date; the speed-up depends on
+    # the calendar only using the precomputed table
+    def scan(*args, **kwargs):
+        raise AssertionError("HijriDate used on the calendar path")
+
+    db.session.add_all([Session(name=f"Kajian {i}", date=date(2026, 1, 5) + timedelta(days=7 * i)) for i in range(20)])
+    db.session.commit()
+    calendar._holiday_events.cache_clear()
+    monkeypatch.setattr(HijriDate, "__init__", scan)
+
+    response = client.get("/api/calendar", query_string={"start": "2026-01-01", "end": "2027-01-01"},
+                          headers=admin_headers)
+    events = response.get_json()
+    assert response.status_code == 200
+    assert sum(e["extendedProps"]["type"] == "rohis_session" for e in events) == 20
+    assert all(" H)" in e["title"] for e in events)
+    assert any(e["extendedProps"]["type"] == "islamic_holiday" for e in events)
@@ -0,0 +1,103 @@
+"""
+Labelled evaluation set for nav_router.match_navigation.
+
+NAVIGATION messages must route to their page; OTHER messages (questions,
+chit-chat, short Q&A that merely mentions a page) must fall through to the
+model. A wrong route sends the user away from their answer, so precision
+matters more than recall: a missed navigation request still reaches Groq,
+which can answer NAVIGATE: itself.
+"""
+
+import pytest
+
+from nav_router import match_navigation
+
+NAVIGATION = [
+    ("open attendance", "attendance"), ("open the attendance page", "attendance"),
+    ("go to attendance", "attendance"), ("show me the attendance page", "attendance"),
+    ("take me to the members page", "members"), ("open member list", "members"),
+    ("show members", "members"), ("go to the dashboard", "dashboard"), ("go home", "dashboard"),
+    ("back to home", "dashboard"), ("open dashboard", "dashboard"), ("navigate to login", "login"),
+    ("take me to login page", "login"), ("open the login page", "login"),
+    ("can you open the attendance page", "attendance"), ("please open members", "members"),
+    ("go to attendence", "attendance"), ("open dashbord", "dashboard"),
+    ("show memebers", "members"), ("attendance page", "attendance"), ("members", "members"),
+    ("dashboard", "dashboard"), ("login page", "login"),
+    ("i want to open the members list", "members"), ("bring me to attendance", "attendance"),
+    ("view attendance", "attendance"), ("open the home page", "dashboard"),
+    ("sign in page", "login"), ("buka absensi", "attendance"),
+    ("buka halaman absensi", "attendance"), ("ke halaman absensi", "attendance"),
+    ("tolong buka absen", "attendance"), ("buka kehadiran", "attendance"),
+    ("lihat presensi", "attendance"), ("buka daftar anggota", "members"),
+    ("tampilkan anggota", "members"), ("lihat daftar anggota", "members"),
+    ("ke halaman anggota", "members"), ("buka beranda", "dashboard"),
+    ("kembali ke beranda", "dashboard"), ("ke halaman utama", "dashboard"),
+    ("buka dasbor", "dashboard"), ("pergi ke dashboard", "dashboard"),
+    ("buka halaman login", "login"), ("ke halaman masuk", "login"), ("buka absensii", "attendance"),
+    ("buka anggot", "members"), ("absensi", "attendance"), ("anggota", "members"),
+    ("beranda", "dashboard"), ("halaman login", "login"), ("arahkan ke absensi", "attendance"),
+    ("pindah ke halaman anggota", "members"), ("bukain absen dong", "attendance"),
+    ("mau lihat kehadiran", "attendance"), ("balik ke home", "dashboard"),
+    ("tampilkan halaman kehadiran", "attendance"), ("liat anggota", "members"),
+    ("open my attendance history", "attendance"), ("check attendance", "attendance"),
+    ("cek absensi", "attendance"), ("absensi dong", "attendance"),
+    ("lihat rekap kehadiran", "attendance"), ("show the list of members", "members"),
+    ("daftar anggota rohis", "members"), ("where is the members page", "members"),
+    ("menu anggota", "members"), ("open the main menu", "dashboard"), ("home", "dashboard"),
+    ("login", "login"), ("let me see the dashboard", "dashboard"), ("saya mau absen", "attendance"),
+    ("ke absensi", "attendance"), ("membuka halaman kehadiran", "attendance"),
+    ("show attendance for last week", "attendance"), ("bring up the member page please", "members"),
+    ("tampilkan dasbor utama", "dashboard"), ("absen sekarang", "attendance"),
+]
+
+OTHER = [
+    "what breaks the fast", "how many rakaat is dhuhr", "apa yang membatalkan puasa",
+    "berapa rakaat sholat dzuhur", "how do I mark attendance", "bagaimana cara absen",
+    "siapa saja anggota rohis", "apa hukum tidak hadir kajian",
+    "what is the meaning of home in islam", "kenapa saya tidak bisa login", "how do i login",
+    "jelaskan tentang zakat fitrah", "assalamualaikum", "terima kasih",
+    "open the quran to surah yasin", "show me a hadith about patience", "buka puasa jam berapa",
+    "kapan buka puasa", "lihat hilal kapan", "tell me about the members of the prophet's family",
+    "remember allah often", "home is where the heart is", "absen sholat jumat hukumnya apa",
+    "members and attendance", "open attendance and members", "doa masuk masjid",
+    "doa sebelum makan", "ceritakan kisah nabi musa", "go to the mosque early",
+    "show some dua for exams", "is attendance at halaqah mandatory",
+    "anggota keluarga nabi siapa saja", "aku lupa password login",
+    "i can't sign in to my account, why", "buka aurat dalam islam",
+    "saya ingin tahu tentang sholat tahajud dan keutamaannya", "sholat dhuha berapa rakaat",
+    "go back", "logout", "open settings", "buka profil", "kembali", "keluar", "hadir",
+    "is it ok to miss kajian", "show me how to pray", "open a new session", "buka sesi baru",
+    "go to attendance then members", "mengapa absensi saya kosong", "open al-fatihah",
+    "lihat jadwal piket", "buka notulensi", "home prayer", "members zakat", "attendance rules",
+    "presensi ramadan", "login problem", "login gagal", "dashboard error", "open attendance rules",
+    "show members zakat", "kehadiran di masjid", "members of ahlul bait", "attendance penalty",
+    "anggota keluarga", "buka absensi ramadan", "home sweet home", "absensi sholat jumat",
+]
+
+PRECISION_THRESHOLD = 0.99
+RECALL_THRESHOLD = 0.9
+
+
+def evaluate():
+    routed = [(text, expected, match_navigation(text)) for text, expected in NAVIGATION]
+    routed += [(text, None, match_navigation(text)) for text in OTHER]
+    true_positives = sum(1 for _, expected, got in routed if got and got == expected)
+    predicted = sum(1 for _, _, got in routed if got)
+    wrong = [(text, expected, got) for text, expected, got in routed if got != expected]
+    return true_positives / predicted, true_positives / len(NAVIGATION), wrong
+
+
+def test_precision_and_recall():
+    precision, recall, wrong = evaluate()
+    assert precision >= PRECISION_THRESHOLD, wrong
+    assert recall >= RECALL_THRESHOLD, wrong
+
+
+@pytest.mark.parametrize("text", OTHER)
+def test_other_messages_fall_through(text):
+    assert match_navigation(text) is None
+
+
+@pytest.mark.parametrize("text", ["", "   ", "?!", "buka buka buka buka buka buka buka buka buka absensi"])
+def test_degenerate_messages_fall_through(text):
+    assert match_navigation(text) is None
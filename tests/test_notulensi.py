@@ -0,0 +1,71 @@
+import base64
+import hashlib
+import io
+from datetime import date
+from unittest import mock
+
+import pytest
+from PIL import Image
+
+from extensions import db
+from models import Notulensi, NotulensiImage, NotulensiRevision, Session
+
+
+def png_data_uri():
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4), (200, 30, 30)).save(buffer, format="PNG")
+    data = buffer.getvalue()
+    return f"data:image/png;base64,{base64.b64encode(data).decode()}", hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def session_id(app):
+    s = Session(name="Rapat", date=date(2026, 1, 5))
+    db.session.add(s)
+    db.session.commit()
+    return s.id
+
+
+def save(client, headers, session_id, content):
+    return client.post(f"/api/notulensi/{session_id}", json={"content": content}, headers=headers)
+
+
+def test_first_save_with_data_uri_image(client, admin_headers, session_id):
+    uri, digest = png_data_uri()
+    response = save(client, admin_headers, session_id, f'<p>Hasil rapat</p><p><img src="{uri}"></p>')
+
+    assert response.status_code == 200, response.get_json()
+    content = response.get_json()["notulensi"]["content"]
+    assert "data:image" not in content
+    assert f'src="/api/notulensi/images/{digest}"' in content
+    assert db.session.get(NotulensiImage, digest).mimetype == "image/png"
+    note = Notulensi.query.filter_by(session_id=session_id).one()
+    assert NotulensiRevision.query.filter_by(notulensi_id=note.id).count() == 1
+
+    image = client.get(f"/api/notulensi/images/{digest}")
+    assert image.status_code == 200
+    assert image.mimetype == "image/png"
+
+
+def test_second_save_records_a_revision(client, admin_headers, session_id):
+    assert save(client, admin_headers, session_id, "<p>Satu</p>").status_code == 200
+    uri, _ = png_data_uri()
+    assert save(client, admin_headers, session_id, f'<p>Dua</p><img src="{uri}">').status_code == 200
+    note = Notulensi.query.filter_by(session_id=session_id).one()
+    assert [r.revision for r in note.revisions] == [1, 2]
+
+
+def test_concurrent_create_is_a_conflict(client, admin_headers, session_id):
+    db.session.add(Notulensi(session_id=session_id, **Notulensi.content_fields("<p>Admin lain</p>")))
+    db.session.commit()
+    # The other admin's row appears after this request looked for it
+    finds_nothing = Notulensi.query.filter_by(id=-1)
+    with mock.patch.object(type(Notulensi.query), "filter_by", lambda self, **kwargs: finds_nothing):
+        response = save(client, admin_headers, session_id, "<p>Punyaku</p>")
+    assert response.status_code == 409
+
+
+def test_other_integrity_errors_are_not_reported_as_conflicts(app, client, admin_headers, foreign_keys):
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+    response = save(client, admin_headers, 999, "<p>Tidak ada sesi</p>")
+    assert response.status_code == 500
@@ -0,0 +1,52 @@
+import base64
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import make_user
+from extensions import db
+from models import Session
+
+
+def cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+@pytest.fixture
+def sessions(app):
+    db.session.add_all([Session(name=f"Session {i}", date=date(2026, 1, 1) + timedelta(days=i)) for i in range(5)])
+    for i in range(5):
+        make_user(name=f"Member {i}", email=f"m{i}@example.com", role="member")
+    db.session.commit()
+
+
+def test_pages_follow_the_cursor(client, admin_headers, sessions):
+    seen, next_cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": next_cursor} if next_cursor else {})}
+        body = client.get("/api/sessions", query_string=params, headers=admin_headers).get_json()
+        seen += [s["date"] for s in body["sessions"]]
+        next_cursor = body["next_cursor"]
+        if not next_cursor:
+            break
+    assert seen == [(date(2026, 1, 1) + timedelta(days=i)).isoformat() for i in reversed(range(5))]
+
+
+@pytest.mark.parametrize("endpoint", ["/api/sessions", "/api/notulensi", "/api/members"])
+@pytest.mark.parametrize("value", [
+    "not base64!", cursor({"a": 1}), cursor([1]), cursor([123, 5]), cursor([None, 5]),
+    cursor(["2026-01-05", "5"]), cursor(["2026-01-05", True]), cursor([["2026-01-05"], 5]),
+    cursor([{"x": 1}, 5]), cursor([1.5, 5]),
+])
+def test_malformed_cursor_is_a_bad_request(client, admin_headers, sessions, endpoint, value):
+    response = client.get(endpoint, query_string={"limit": 2, "cursor": value}, headers=admin_headers)
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "invalid_data"
+
+
+@pytest.mark.parametrize("endpoint", ["/api/sessions", "/api/notulensi"])
+def test_invalid_cursor_date_is_a_bad_request(client, admin_headers, sessions, endpoint):
+    response = client.get(endpoint, query_string={"limit": 2, "cursor": cursor(["2026-13-45", 5])},
+                          headers=admin_headers)
+    assert response.status_code == 400
@@ -0,0 +1,22 @@
+from conftest import make_user
+from routes.auth import identity_cache
+
+
+def test_profile_update_refreshes_cached_identity(client, admin, admin_headers):
+    assert client.get("/api/auth/me", headers=admin_headers).status_code == 200
+    assert identity_cache.get(admin.id).name == "Admin"
+
+    response = client.put("/api/profile", headers=admin_headers,
+                          json={"name": "Ketua Baru", "email": "Ketua@Example.com"})
+    assert response.status_code == 200
+    assert response.get_json()["user"]["name"] == "Ketua Baru"
+
+    assert client.get("/api/auth/me", headers=admin_headers).status_code == 200
+    principal = identity_cache.get(admin.id)
+    assert (principal.name, principal.email) == ("Ketua Baru", "ketua@example.com")
+
+
+def test_profile_email_must_be_unique(client, admin_headers):
+    make_user(name="Other", email="other@example.com", role="member")
+    response = client.put("/api/profile", headers=admin_headers, json={"email": "other@example.com"})
+    assert response.status_code == 409
@@ -0,0 +1,73 @@
+import hashlib
+import os
+
+import pytest
+from sqlalchemy import insert
+
+from conftest import count_queries
+from extensions import db
+from models import JadwalPiket, PiketAssignment, User
+
+AVATAR_BYTES = 64 * 1024
+
+# Queries per request, whatever the number of users: one loads the caller
+# (token_required), the rest are the endpoint's own
+ENDPOINT_QUERIES = {
+    "/api/auth/me": 2,
+    "/api/members": 2,
+    "/api/attendance/history/all": 2,
+}
+
+
+def seed(members):
+    avatar = os.urandom(AVATAR_BYTES)
+    db.session.execute(insert(User), [
+        {
+            "name": f"Member {i}", "email": f"m{i}@example.com", "role": "member", "password": "x",
+            "profile_picture_data": avatar, "profile_picture_filename": "avatar.png",
+            "profile_picture_hash": hashlib.sha256(avatar).hexdigest(),
+        }
+        for i in range(members)
+    ])
+    db.session.commit()
+    return avatar
+
+
+@pytest.mark.parametrize("members", [5, 200])
+@pytest.mark.parametrize("endpoint", sorted(ENDPOINT_QUERIES))
+def test_user_queries_skip_the_avatar_blob(client, admin_headers, members, endpoint):
+    seed(members)
+    with count_queries() as statements:
+        response = client.get(endpoint, headers=admin_headers)
+    assert response.status_code == 200
+    assert len(statements) == ENDPOINT_QUERIES[endpoint]
+    assert not [s for s in statements if "profile_picture_data" in s]
+
+
+def test_piket_view_skips_the_avatar_blob(client, admin_headers):
+    seed(10)
+    jadwal = JadwalPiket(day_of_week=0, day_name="Senin")
+    db.session.add(jadwal)
+    db.session.flush()
+    db.session.add_all([PiketAssignment(jadwal_id=jadwal.id, user_id=u.id) for u in User.query.limit(5)])
+    db.session.commit()
+    with count_queries() as statements:
+        assert client.get("/api/piket", headers=admin_headers).status_code == 200
+    assert statements
+    assert not [s for s in statements if "profile_picture_data" in s]
+
+
+def test_serving_the_picture_loads_the_blob_once(client):
+    avatar = seed(1)
+    user_id = User.query.filter_by(role="member").one().id
+    with count_queries() as statements:
+        response = client.get(f"/api/profile/picture/{user_id}")
+    assert response.status_code == 200
+    assert response.data == avatar
+    assert len([s for s in statements if "profile_picture_data" in s]) == 1
+
+    with count_queries() as statements:
+        response = client.get(f"/api/profile/picture/{user_id}",
+                              headers={"If-None-Match": f'"{hashlib.sha256(avatar).hexdigest()}"'})
+    assert response.status_code == 304
+    assert not [s for s in statements if "profile_picture_data" in s]
@@ -0,0 +1,131 @@
+import re
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, text
+
+from conftest import auth_header
+from extensions import db
+from models import (
+    Attendance, EmailReminderLog, JadwalPiket, Notulensi, Pic, PiketAssignment,
+    Session, SessionPIC, User,
+)
+
+# Tables that grow with use; reading any of them end to end is a regression.
+# Small lookup tables (user, pic, jadwal_piket) are left out on purpose.
+HOT_TABLES = {"attendance", "session_pic", "notulensi", "piket_assignment", "email_reminder_log"}
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@contextmanager
+def capture_selects():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def full_scans(statement, parameters):
+    with db.engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    scans = []
+    for row in plan:
+        match = FULL_SCAN.match(row[-1])
+        if match and match.group(1) in HOT_TABLES:
+            scans.append(row[-1])
+    return scans
+
+
+@pytest.fixture
+def seeded(app):
+    start = date.today() - timedelta(days=30)
+    db.session.execute(insert(User), [
+        {"name": f"Member {i}", "email": f"m{i}@example.com", "role": "member", "password": "x"}
+        for i in range(50)
+    ])
+    db.session.execute(insert(Session), [
+        {"name": f"Session {i}", "date": start + timedelta(days=i), "session_type": "all"}
+        for i in range(60)
+    ])
+    db.session.execute(insert(Pic), [{"name": f"PIC {i}"} for i in range(3)])
+    session_ids = [id_ for (id_,) in db.session.query(Session.id)]
+    user_ids = [id_ for (id_,) in db.session.query(User.id)]
+    pic_ids = [id_ for (id_,) in db.session.query(Pic.id)]
+    db.session.execute(insert(SessionPIC), [
+        {"session_id": session_id, "pic_id": pic_ids[i % len(pic_ids)]}
+        for i, session_id in enumerate(session_ids)
+    ])
+    db.session.execute(insert(Attendance), [
+        {"session_id": session_id, "user_id": user_id, "status": "present"}
+        for session_id in session_ids
+        for user_id in user_ids
+    ])
+    db.session.execute(insert(Notulensi), [
+        {"session_id": session_id, **Notulensi.content_fields(f"<p>Notulensi {session_id}</p>")}
+        for session_id in session_ids
+    ])
+    db.session.execute(insert(JadwalPiket), [
+        {"day_of_week": idx, "day_name": f"Day {idx}"} for idx in range(7)
+    ])
+    jadwal_ids = [id_ for (id_,) in db.session.query(JadwalPiket.id)]
+    db.session.execute(insert(PiketAssignment), [
+        {"jadwal_id": jadwal_ids[i % len(jadwal_ids)], "user_id": user_id}
+        for i, user_id in enumerate(user_ids)
+    ])
+    db.session.execute(insert(EmailReminderLog), [
+        {"day_of_week": i % 7, "day_name": f"Day {i % 7}", "sent_at": datetime(2026, 1, 1) + timedelta(days=i)}
+        for i in range(200)
+    ])
+    db.session.commit()
+    return {"session_id": session_ids[10], "user_id": user_ids[-1]}
+
+
+# The unpaginated /api/sessions returns every session with its PICs, so it
+# reads those tables whole by design and is not listed here
+HOT_ENDPOINTS = [
+    "/api/sessions?limit=10",
+    "/api/sessions?from={from_}&to={to}",
+    "/api/sessions/{session_id}/pics",
+    "/api/sessions/{session_id}/attendance",
+    "/api/feed",
+    "/api/calendar",
+    "/api/attendance/history",
+    "/api/attendance/history/{user_id}",
+    "/api/notulensi/{session_id}",
+    "/api/piket",
+    "/api/piket/logs",
+]
+
+
+@pytest.mark.parametrize("endpoint", HOT_ENDPOINTS)
+def test_hot_queries_use_indexes(app, client, admin_headers, seeded, endpoint):
+    url = endpoint.format(
+        from_=date.today().isoformat(),
+        to=(date.today() + timedelta(days=7)).isoformat(),
+        **seeded,
+    )
+    with capture_selects() as statements:
+        response = client.get(url, headers=admin_headers)
+    assert response.status_code == 200, response.get_json()
+    assert statements
+
+    scans = {statement: full_scans(statement, parameters) for statement, parameters in statements}
+    assert {statement: s for statement, s in scans.items() if s} == {}
+
+
+def test_member_history_uses_indexes(app, client, seeded):
+    member = db.session.get(User, seeded["user_id"])
+    with capture_selects() as statements:
+        response = client.get("/api/attendance/history", headers=auth_header(app, member))
+    assert response.status_code == 200
+    assert response.get_json()["records"]
+    assert all(not full_scans(statement, parameters) for statement, parameters in statements)
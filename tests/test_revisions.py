@@ -0,0 +1,121 @@
+import random
+from datetime import date
+
+import pytest
+
+from conftest import auth_header, make_user
+from extensions import db
+from models import Notulensi, NotulensiRevision, Session
+from revisions import apply_delta, get_revision_content, make_delta, tokenize
+
+WORDS = ["rapat", "kajian", "Ramadan", "iftar", "panitia", "&amp;", "dana", "jadwal", "—", "sholat", "infaq"]
+
+
+def edit(content, rng):
+    """A random editor-like change: add, drop or reword a paragraph, or touch its markup."""
+    paragraphs = content.split("</p>")[:-1]
+    choice = rng.randrange(5)
+    if choice == 0 or not paragraphs:
+        paragraphs.insert(rng.randrange(len(paragraphs) + 1), "<p>" + " ".join(rng.choices(WORDS, k=6)))
+    elif choice == 1 and len(paragraphs) > 1:
+        paragraphs.pop(rng.randrange(len(paragraphs)))
+    elif choice == 2:
+        i = rng.randrange(len(paragraphs))
+        words = paragraphs[i].split(" ")
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+        paragraphs[i] = " ".join(words)
+    elif choice == 3:
+        i = rng.randrange(len(paragraphs))
+        paragraphs[i] = paragraphs[i].replace("<p>", '<p class="ql-align-center"><strong>', 1) + "</strong>"
+    else:
+        i = rng.randrange(len(paragraphs))
+        paragraphs[i] += "  \n" + rng.choice(WORDS)
+    return "".join(p + "</p>" for p in paragraphs)
+
+
+@pytest.fixture
+def session_id(app):
+    s = Session(name="Rapat", date=date(2026, 1, 5))
+    db.session.add(s)
+    db.session.commit()
+    return s.id
+
+
+def save(client, headers, session_id, content):
+    response = client.post(f"/api/notulensi/{session_id}", json={"content": content}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()["notulensi"]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_delta_round_trip(seed):
+    rng = random.Random(seed)
+    old = "<p>Rapat dibuka</p><p>Agenda: kajian &amp; iftar</p>"
+    for _ in range(rng.randrange(1, 6)):
+        old = edit(old, rng)
+    new = old
+    for _ in range(rng.randrange(1, 6)):
+        new = edit(new, rng)
+    assert apply_delta(old, make_delta(old, new)) == new
+
+
+@pytest.mark.parametrize("text", ["", "<p>", "a  b\n\tc", "<p unclosed", "x < y > z", "<p>é 日本</p>"])
+def test_tokenize_keeps_every_character(text):
+    assert "".join(tokenize(text)) == text
+
+
+def test_every_revision_rebuilds_the_saved_text(app, client, admin_headers, session_id):
+    interval = app.config["NOTULENSI_SNAPSHOT_INTERVAL"]
+    rng = random.Random(7)
+    content = "<p>Rapat dibuka</p><p>Agenda: kajian &amp; iftar</p>"
+    saved = []
+    while len(saved) < 2 * interval + 3:
+        content = edit(content, rng)
+        note = save(client, admin_headers, session_id, content)
+        if not saved or note["content"] != saved[-1]:
+            saved.append(note["content"])
+
+    note_id = note["id"]
+    rows = NotulensiRevision.query.filter_by(notulensi_id=note_id).order_by(NotulensiRevision.revision).all()
+    assert [r.revision for r in rows] == list(range(1, len(saved) + 1))
+    assert [r.revision for r in rows if r.is_snapshot] == [1, interval + 1, 2 * interval + 1]
+    for revision, text in enumerate(saved, start=1):
+        assert get_revision_content(note_id, revision) == text
+    assert get_revision_content(note_id, len(saved) + 1) is None
+
+
+def test_unchanged_save_adds_no_revision(client, admin_headers, session_id):
+    note = save(client, admin_headers, session_id, "<p>Satu</p>")
+    save(client, admin_headers, session_id, "<p>Satu</p>")
+    assert NotulensiRevision.query.filter_by(notulensi_id=note["id"]).count() == 1
+
+
+def test_revision_endpoints(app, client, admin, admin_headers, session_id):
+    versions = ["<p>Satu</p>", "<p>Satu</p><p>Dua</p>", "<p>Tiga</p>"]
+    for content in versions:
+        note = save(client, admin_headers, session_id, content)
+    member = make_user(name="Member", email="member@example.com", role="member")
+    member_headers = auth_header(app, member)
+    base = f"/api/notulensi/by-id/{note['id']}/revisions"
+
+    listed = client.get(base, headers=member_headers).get_json()["revisions"]
+    assert [r["revision"] for r in listed] == [3, 2, 1]
+    assert all(r["author_id"] == admin.id and r["author_name"] == "Admin" for r in listed)
+    assert listed[0]["content_size"] == len(versions[2])
+
+    response = client.get(f"{base}/2", headers=member_headers)
+    assert response.get_json()["content"] == versions[1]
+    assert client.get(f"{base}/9", headers=member_headers).status_code == 404
+    assert client.get("/api/notulensi/by-id/999/revisions", headers=member_headers).status_code == 404
+
+    assert client.post(f"{base}/1/restore", headers=member_headers).status_code == 403
+    assert db.session.get(Notulensi, note["id"]).content == versions[2]
+
+    assert client.post(f"{base}/9/restore", headers=admin_headers).status_code == 404
+    response = client.post(f"{base}/1/restore", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_json()["notulensi"]["content"] == versions[0]
+    # Restoring adds a revision rather than rewriting history
+    assert [r["revision"] for r in client.get(base, headers=member_headers).get_json()["revisions"]] == [4, 3, 2, 1]
+    assert get_revision_content(note["id"], 4) == versions[0]
+    assert get_revision_content(note["id"], 3) == versions[2]
@@ -0,0 +1,81 @@
+from datetime import date
+
+import pytest
+
+from extensions import db
+from models import Session
+from search import MARK_END, MARK_START, highlight, search
+
+
+@pytest.fixture
+def make_session(app):
+    def make(name="Rapat"):
+        s = Session(name=name, date=date(2026, 1, 5))
+        db.session.add(s)
+        db.session.commit()
+        return s.id
+    return make
+
+
+def save(client, headers, session_id, content):
+    response = client.post(f"/api/notulensi/{session_id}", json={"content": content}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()["notulensi"]["id"]
+
+
+def find(client, headers, q):
+    response = client.get("/api/notulensi/search", query_string={"q": q}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()["results"]
+
+
+def test_highlight_escapes_before_marking():
+    snippet = f'<img src=x onerror="alert(1)"> & {MARK_START}kajian{MARK_END} </mark>'
+    assert highlight(snippet) == (
+        "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; &amp; <mark>kajian</mark> &lt;/mark&gt;"
+    )
+
+
+def test_snippets_escape_note_text(client, admin_headers, make_session):
+    save(client, admin_headers, make_session(), "<p>&lt;script&gt;kajian&lt;/script&gt; &amp; infaq</p>")
+    [hit] = find(client, admin_headers, "kajian")
+    assert hit["snippet"] == "&lt;script&gt;<mark>kajian</mark>&lt;/script&gt; &amp; infaq"
+
+
+@pytest.mark.parametrize("q", [
+    '"', '""', '*', 'kaj*', 'NEAR', 'NEAR(kajian iftar)', '-', '-kajian', 'kajian -iftar',
+    'AND', 'kajian OR', 'NOT iftar', 'body:kajian', '(kajian', '^kajian', 'kajian + iftar', "'; DROP TABLE x; --",
+])
+def test_fts_syntax_in_queries_is_matched_literally(client, admin_headers, make_session, q):
+    save(client, admin_headers, make_session(), "<p>Kajian dan iftar bersama, near the masjid</p>")
+    results = find(client, admin_headers, q)
+    words = "".join(c if c.isalnum() else " " for c in q.lower()).split()
+    expected = 1 if words and all(w in {"kajian", "iftar", "near"} for w in words) else 0
+    assert len(results) == expected
+
+
+def test_punctuation_only_query_finds_nothing(client, admin_headers, make_session):
+    save(client, admin_headers, make_session(), "<p>Kajian</p>")
+    assert find(client, admin_headers, '"*-') == []
+    assert search("") == []
+
+
+def test_index_follows_saves_and_deletes(client, admin_headers, make_session):
+    first, second = make_session("Satu"), make_session("Dua")
+    note_id = save(client, admin_headers, first, "<p>Rencana iftar bersama</p>")
+    save(client, admin_headers, second, "<p>Rencana kajian pekanan</p>")
+    assert [r["session_id"] for r in find(client, admin_headers, "iftar")] == [first]
+    assert len(find(client, admin_headers, "rencana")) == 2
+
+    save(client, admin_headers, first, "<p>Rencana tarawih</p>")
+    assert find(client, admin_headers, "iftar") == []
+    assert [r["notulensi_id"] for r in find(client, admin_headers, "tarawih")] == [note_id]
+
+    assert client.delete(f"/api/notulensi/by-id/{note_id}", headers=admin_headers).status_code == 200
+    assert find(client, admin_headers, "tarawih") == []
+    assert search("tarawih") == []
+
+    assert client.delete(f"/api/sessions/{second}", headers=admin_headers).status_code == 200
+    assert find(client, admin_headers, "kajian") == []
+    # The index entry itself is gone, not just filtered out by the endpoint
+    assert search("kajian") == []
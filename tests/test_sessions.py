@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from conftest import count_queries, make_user
+from extensions import db
+from models import Attendance, Pic, Session, SessionPIC, User
+
+
+def seed(sessions, members):
+    start = date(2025, 1, 1)
+    db.session.execute(insert(User), [
+        {"name": f"Member {i}", "email": f"m{i}@example.com", "role": "member", "password": "x"}
+        for i in range(members)
+    ])
+    db.session.execute(insert(Session), [
+        {"name": f"Session {i}", "date": start + timedelta(days=i), "session_type": "all"}
+        for i in range(sessions)
+    ])
+    db.session.execute(insert(Pic), [{"name": f"PIC {i}"} for i in range(3)])
+    session_ids = [id_ for (id_,) in db.session.query(Session.id)]
+    user_ids = [id_ for (id_,) in db.session.query(User.id).filter(User.role == "member")]
+    pic_ids = [id_ for (id_,) in db.session.query(Pic.id)]
+    db.session.execute(insert(SessionPIC), [
+        {"session_id": session_id, "pic_id": pic_ids[i % len(pic_ids)]}
+        for i, session_id in enumerate(session_ids)
+    ])
+    db.session.execute(insert(Attendance), [
+        {"session_id": session_id, "user_id": user_id, "status": "present"}
+        for session_id in session_ids
+        for user_id in user_ids
+    ])
+    db.session.commit()
+
+
+# One query loads the caller, one the sessions with their attendance counts
+# and one the PICs of those sessions
+LIST_SESSIONS_QUERIES = 3
+
+
+@pytest.mark.parametrize("sessions, members", [(10, 5), (1000, 100)])
+def test_list_sessions_runs_constant_queries(app, client, admin_headers, sessions, members):
+    seed(sessions, members)
+    with count_queries() as statements:
+        response = client.get("/api/sessions", headers=admin_headers)
+
+    assert response.status_code == 200
+    listed = response.get_json()["sessions"]
+    assert len(listed) == sessions
+    assert all(s["attendance_count"] == members for s in listed)
+    assert all(len(s["assigned_pics"]) == 1 for s in listed)
+    assert len(statements) == LIST_SESSIONS_QUERIES
+
+
+def test_list_sessions_matches_serializer(app, client, admin_headers):
+    admin = User.query.first()
+    s = Session(name="Kajian", date=date(2026, 1, 5))
+    pic = Pic(name="Dakwah")
+    db.session.add_all([s, pic])
+    db.session.flush()
+    db.session.add(SessionPIC(session_id=s.id, pic_id=pic.id))
+    db.session.add(Attendance(session_id=s.id, user_id=admin.id, status="present"))
+    member = make_user(name="Member", email="member@example.com", role="member")
+    db.session.add(Attendance(session_id=s.id, user_id=member.id, status="absent"))
+    db.session.commit()
+
+    from serializers import serialize_session
+    expected = serialize_session(s)
+    response = client.get("/api/sessions", headers=admin_headers)
+    assert response.get_json()["sessions"] == [expected]
@@ -0,0 +1,112 @@
+import threading
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import summary_cache
+from extensions import db
+from models import Notulensi, NotulensiSummary, Session
+from summarizer import DEFAULT_SUMMARY
+
+CONTENT = "<p>Rapat membahas program Ramadan dan pembagian tugas panitia buka puasa bersama.</p>"
+
+
+@pytest.fixture
+def note(app):
+    s = Session(name="Rapat", date=date(2026, 1, 5))
+    db.session.add(s)
+    db.session.flush()
+    note = Notulensi(session_id=s.id, **Notulensi.content_fields(CONTENT))
+    db.session.add(note)
+    db.session.commit()
+    return note
+
+
+@pytest.fixture
+def summarizer(app, monkeypatch):
+    """Replaces the LLM call and runs each queued job to completion before returning."""
+    calls = []
+    outcome = {"result": DEFAULT_SUMMARY}
+
+    def generate_summary(text):
+        calls.append(text)
+        if isinstance(outcome["result"], Exception):
+            raise outcome["result"]
+        return outcome["result"]
+
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setitem(app.config, "SUMMARY_RETRY_BACKOFF", 0)
+    monkeypatch.setattr(summary_cache, "generate_summary", generate_summary)
+    monkeypatch.setattr(summary_cache, "submit", run_in_thread(app))
+    return calls, outcome
+
+
+def run_in_thread(app):
+    # Jobs get their own thread, and so their own database session, as in tasks.submit
+    def submit(fn, *args):
+        def run():
+            with app.app_context():
+                try:
+                    fn(*args)
+                finally:
+                    db.session.remove()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+    return submit
+
+
+def row_for(note):
+    return NotulensiSummary.query.filter_by(notulensi_id=note.id).one()
+
+
+@pytest.mark.parametrize("result", [DEFAULT_SUMMARY, ConnectionError("Groq is down")])
+def test_failed_summary_is_not_retried_until_backoff(app, client, admin_headers, note, summarizer, result):
+    calls, outcome = summarizer
+    outcome["result"] = result
+
+    for _ in range(3):
+        response = client.get("/api/feed", headers=admin_headers)
+        assert response.get_json()["recent"][0]["summary"] == note.excerpt
+
+    attempts = 1 if result == DEFAULT_SUMMARY else app.config["SUMMARY_MAX_ATTEMPTS"]
+    assert len(calls) == attempts
+    row = row_for(note)
+    assert row.summary is None
+    assert row.failures == 1
+    assert row.retry_after > datetime.utcnow()
+
+
+def test_backoff_doubles_and_success_clears_the_marker(app, client, admin_headers, note, summarizer):
+    calls, outcome = summarizer
+    client.get("/api/feed", headers=admin_headers)
+    first_delay = row_for(note).retry_after - datetime.utcnow()
+
+    row_for(note).retry_after = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    client.get("/api/feed", headers=admin_headers)
+    assert row_for(note).failures == 2
+    assert row_for(note).retry_after - datetime.utcnow() > first_delay * 1.5
+
+    row_for(note).retry_after = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    outcome["result"] = "Panitia buka puasa bersama dibentuk."
+    client.get("/api/feed", headers=admin_headers)
+    row = row_for(note)
+    assert (row.summary, row.failures, row.retry_after) == ("Panitia buka puasa bersama dibentuk.", 0, None)
+    assert client.get("/api/feed", headers=admin_headers).get_json()["recent"][0]["summary"] == row.summary
+    assert len(calls) == 3
+
+
+def test_edited_content_is_tried_again(app, client, admin_headers, note, summarizer):
+    calls, _ = summarizer
+    client.get("/api/feed", headers=admin_headers)
+    assert len(calls) == 1
+
+    response = client.post(f"/api/notulensi/{note.session_id}",
+                           json={"content": CONTENT + "<p>Ditambah jadwal kajian.</p>"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert NotulensiSummary.query.count() == 1
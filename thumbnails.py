@@ -0,0 +1,101 @@
+"""
+Profile picture thumbnails.
+
+Uploads are stored as-is; a background job then produces square WebP
+variants at a fixed set of sizes so lists of small avatars don't download
+full-size photos. Until the variants exist the original image is served.
+"""
+
+import logging
+import threading
+from io import BytesIO
+from PIL import Image, ImageOps
+from extensions import db
+from models import User, ProfilePictureVariant
+from tasks import submit
+
+logger = logging.getLogger(__name__)
+
+PICTURE_SIZES = (64, 128, 512)
+WEBP_QUALITY = 80
+
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def pick_size(requested):
+    """Smallest generated size that covers the requested one (capped at the largest)."""
+    for size in PICTURE_SIZES:
+        if requested <= size:
+            return size
+    return PICTURE_SIZES[-1]
+
+
+def enqueue_variants(user_id, source_hash):
+    """Queue a job building every variant for the given picture; no-op if already queued."""
+    key = (user_id, source_hash)
+    with _pending_lock:
+        if key in _pending:
+            return False
+        _pending.add(key)
+
+    try:
+        submit(_build_variants, user_id, source_hash)
+    except Exception:
+        with _pending_lock:
+            _pending.discard(key)
+        raise
+    return True
+
+
+def render_variants(data):
+    """Decode an image once and return {size: webp_bytes} for every PICTURE_SIZES entry."""
+    with Image.open(BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+        side = min(img.size)
+        square = ImageOps.fit(img, (side, side), Image.LANCZOS)
+
+    variants = {}
+    for size in PICTURE_SIZES:
+        thumb = square.copy()
+        thumb.thumbnail((size, size), Image.LANCZOS)
+        out = BytesIO()
+        thumb.save(out, format="WEBP", quality=WEBP_QUALITY, method=4)
+        variants[size] = out.getvalue()
+    return variants
+
+
+def _build_variants(user_id, source_hash):
+    try:
+        row = (
+            db.session.query(User.profile_picture_hash, User.profile_picture_data)
+            .filter(User.id == user_id)
+            .first()
+        )
+        if not row or row.profile_picture_hash != source_hash or not row.profile_picture_data:
+            # Picture was replaced or removed since the job was queued
+            return
+        data = row.profile_picture_data
+        # Don't hold a pooled connection while resizing
+        db.session.close()
+
+        try:
+            variants = render_variants(data)
+        except Exception as e:
+            logger.warning("Cannot build thumbnails for user %s: %s", user_id, e)
+            return
+
+        try:
+            ProfilePictureVariant.query.filter_by(user_id=user_id).delete()
+            for size, webp in variants.items():
+                db.session.add(ProfilePictureVariant(
+                    user_id=user_id, size=size, source_hash=source_hash, data=webp,
+                ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Failed to store thumbnails for user %s", user_id)
+    finally:
+        with _pending_lock:
+            _pending.discard((user_id, source_hash))
@@ -1,8 +1,37 @@
+import re
+from datetime import date
+from html import unescape
+
+EXCERPT_LENGTH = 150
+
+_TAG_RE = re.compile("<[^<]+?>")
+
+
+def parse_iso_date(value):
+    """Parse YYYY-MM-DD (a trailing time part, as FullCalendar sends, is ignored). Raises ValueError."""
+    return date.fromisoformat(value.strip()[:10]) if value else None
+
+
+def html_to_text(html_content, separator=""):
+    """Strip tags from rich-text HTML (replacing each with `separator`) and unescape entities."""
+    return unescape(_TAG_RE.sub(separator, html_content or "")).strip()
+
+
+def html_to_plain_text(html_content):
+    """Readable text of rich-text HTML: tags become spaces and whitespace is collapsed."""
+    return " ".join(html_to_text(html_content, separator=" ").split())
+
+
+def make_excerpt(text, max_len=EXCERPT_LENGTH):
+    return (text[:max_len] + "...") if len(text) > max_len else text
+
+
 def can_mark_attendance(user, target_pic_id):
     if user.role in ['admin', 'pembina']:
         return True
 
-    if user.id == target_pic_id:
+    # Members of a PIC mark attendance for that PIC's sessions
+    if user.pic_id is not None and user.pic_id == target_pic_id:
         return True
 
     return False